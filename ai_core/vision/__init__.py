@@ -1 +1,3 @@
-from .hand_tracking import Hand, Hands
+from .hand_tracking import HAND_CONNECTIONS, BaseHands, Hand, HandLandmark, Hands, TrackedHands
+from .gestures import Gesture, GestureDebouncer, GestureRecognizer
+from .inference_pool import InferencePool
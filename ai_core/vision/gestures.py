@@ -0,0 +1,245 @@
+from dataclasses import dataclass
+from collections import deque
+import numpy as np
+from .hand_tracking import Hand, HandLandmark
+
+
+# Every finger state is computed once per frame into a boolean vector with these features, in this order.
+FEATURES = (
+    "upright",  # The distal joints of the four fingers are above the wrist
+    "index_extended",
+    "middle_extended",
+    "ring_extended",
+    "pinky_extended",
+    "index_curled",
+    "middle_curled",
+    "ring_curled",
+    "pinky_curled",
+    "thumb_down",  # The tip of the thumb is below the base of the index finger
+)
+
+_MCP = [
+    HandLandmark.INDEX_FINGER_MCP,
+    HandLandmark.MIDDLE_FINGER_MCP,
+    HandLandmark.RING_FINGER_MCP,
+    HandLandmark.PINKY_MCP,
+]
+_DIP = [
+    HandLandmark.INDEX_FINGER_DIP,
+    HandLandmark.MIDDLE_FINGER_DIP,
+    HandLandmark.RING_FINGER_DIP,
+    HandLandmark.PINKY_DIP,
+]
+
+
+@dataclass(frozen=True)
+class Gesture:
+    """Signature of a gesture: the value that each listed feature must have, the features that are not listed are ignored"""
+
+    name: str
+    label: str  # Text displayed when the gesture is recognized
+    conditions: tuple[tuple[str, bool], ...]
+
+
+class GestureRecognizer:
+    def __init__(self, thumb_margin: int = 50, register_defaults: bool = True):
+        """Classifies the gesture of a hand by matching its finger states against a registry of gesture signatures.
+
+        The gestures are checked in the order of the registry and the first one that matches is returned.
+
+        :param thumb_margin: How many pixels the tip of the thumb must be below the base of the index finger to count as pointing down
+        :param register_defaults: If True, the start, stop, wait, move and rotate gestures are registered
+        """
+        self.thumb_margin = thumb_margin
+        self.__gestures = []
+        self.__care = np.zeros((0, len(FEATURES)), dtype=bool)
+        self.__values = np.zeros((0, len(FEATURES)), dtype=bool)
+
+        if register_defaults:
+            curled = dict(
+                index_curled=True,
+                middle_curled=True,
+                ring_curled=True,
+                pinky_curled=True,
+            )
+            extended = dict(
+                index_extended=True,
+                middle_extended=True,
+                ring_extended=True,
+                pinky_extended=True,
+            )
+
+            self.register("start", "Start", upright=True, **curled)
+            self.register("stop", "Stop", upright=True, thumb_down=True, **extended)
+            self.register("wait", "Wait...", upright=True, **extended)
+            self.register(
+                "move",
+                "Move",
+                upright=True,
+                index_extended=True,
+                middle_curled=True,
+                ring_curled=True,
+                pinky_curled=True,
+            )
+            self.register(
+                "rotate",
+                "Rotate",
+                upright=True,
+                index_extended=True,
+                middle_extended=True,
+                ring_curled=True,
+                pinky_curled=True,
+            )
+
+    @property
+    def gestures(self) -> tuple[Gesture, ...]:
+        return tuple(self.__gestures)
+
+    def register(
+        self,
+        name: str,
+        label: str | None = None,
+        index: int | None = None,
+        **conditions,
+    ) -> Gesture:
+        """Adds a gesture to the registry.
+
+        :param name: Name of the gesture, a gesture with the same name is replaced
+        :param label: Text displayed when the gesture is recognized, by default the name
+        :param index: Position in the registry, by default the gesture is checked last
+        :param conditions: The required value of the features. Example: **index_extended=True, middle_curled=True**
+        :return: The registered gesture
+        """
+        unknown = set(conditions) - set(FEATURES)
+        if unknown:
+            raise ValueError(
+                f"Unknown gesture features: {', '.join(sorted(unknown))}"
+            )
+
+        gesture = Gesture(
+            name=name,
+            label=name if label is None else label,
+            conditions=tuple(
+                (feature, bool(conditions[feature]))
+                for feature in FEATURES
+                if feature in conditions
+            ),
+        )
+
+        self.unregister(name)
+        self.__gestures.insert(
+            len(self.__gestures) if index is None else index, gesture
+        )
+        self.__compile()
+
+        return gesture
+
+    def unregister(self, name: str):
+        """Removes a gesture from the registry"""
+        self.__gestures = [g for g in self.__gestures if g.name != name]
+        self.__compile()
+
+    def __compile(self):
+        """Builds the matrices used to match all the signatures at once"""
+        self.__care = np.zeros((len(self.__gestures), len(FEATURES)), dtype=bool)
+        self.__values = np.zeros_like(self.__care)
+
+        for row, gesture in enumerate(self.__gestures):
+            for feature, value in gesture.conditions:
+                self.__care[row, FEATURES.index(feature)] = True
+                self.__values[row, FEATURES.index(feature)] = value
+
+    def features(self, landmarks: np.ndarray) -> np.ndarray:
+        """:param landmarks: A (21, 3) array with the coordinates of the points of the hand on the frame
+        :return: A boolean vector with the state of every feature listed in **FEATURES**
+        """
+        y = landmarks[:, 1]
+        mcp, dip = y[_MCP], y[_DIP]
+
+        return np.concatenate(
+            (
+                [(y[HandLandmark.WRIST] > dip).all()],
+                mcp > dip,
+                mcp < dip,
+                [
+                    y[HandLandmark.THUMB_TIP] - self.thumb_margin
+                    > y[HandLandmark.INDEX_FINGER_MCP]
+                ],
+            )
+        )
+
+    def classify(self, hand: Hand | np.ndarray) -> Gesture | None:
+        """:param hand: The hand or the (21, 3) array with its coordinates on the frame
+        :return: The first registered gesture whose signature matches the hand, None if there is no match
+        """
+        landmarks = hand.landmarks if isinstance(hand, Hand) else hand
+        mismatch = (self.__values != self.features(landmarks)) & self.__care
+        matches = ~mismatch.any(axis=1)
+
+        if not matches.any():
+            return None
+
+        return self.__gestures[int(matches.argmax())]
+
+
+class GestureDebouncer:
+    def __init__(
+        self,
+        window: int = 5,
+        confirm: int = 3,
+        release: int = 3,
+        confirm_frames: dict[str, int] | None = None,
+    ):
+        """Turns the per-frame classifications into stable gestures, so that one misclassified frame does not change the command.
+
+        The last **window** classifications are kept in a ring buffer. A new gesture is accepted once it was seen in **confirm** of them (more for the gestures listed in **confirm_frames**) and in the last one.
+        The accepted gesture is kept until it was missing from the last **release** frames, which is the hysteresis: a short dropout does not end it.
+
+        :param window: Number of recent classifications kept
+        :param confirm: How many of them must agree before a gesture is accepted
+        :param release: After how many consecutive frames without it the accepted gesture ends
+        :param confirm_frames: Confirmation for specific gestures, for example **{"start": 4}** for the ones that make the drone take off or land
+        """
+        self.confirm = confirm
+        self.release = release
+        self.confirm_frames = dict(confirm_frames or {})
+        self.window = max(window, confirm, release, *self.confirm_frames.values())
+        self.__history = deque(maxlen=self.window)
+        self.__missing = 0
+
+        self.gesture = None  # The accepted gesture, None when no gesture is shown
+        self.changed = False  # True on the frame the accepted gesture changed
+        self.rejected = 0  # Classifications that differed from the accepted gesture
+
+    def reset(self):
+        self.__history.clear()
+        self.__missing = 0
+        self.gesture = None
+        self.changed = False
+
+    def update(self, gesture: Gesture | None) -> Gesture | None:
+        """:param gesture: The classification of the current frame, None when no gesture was recognized or there was no hand
+        :return: The accepted gesture. **changed** tells if it was accepted on this frame.
+        """
+        self.__history.append(gesture)
+        previous = self.gesture
+
+        if self.gesture is not None:
+            self.__missing = 0 if gesture == self.gesture else self.__missing + 1
+
+            if self.__missing >= self.release:
+                self.gesture = None
+
+        if gesture is not None and gesture != self.gesture:
+            needed = self.confirm_frames.get(gesture.name, self.confirm)
+
+            if sum(1 for seen in self.__history if seen == gesture) >= needed:
+                self.gesture = gesture
+                self.__missing = 0
+
+        if gesture is not None and gesture != self.gesture:
+            self.rejected += 1
+
+        self.changed = self.gesture != previous
+
+        return self.gesture
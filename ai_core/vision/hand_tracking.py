@@ -1,69 +1,272 @@
-from dataclasses import dataclass
-import mediapipe as mp
+from abc import ABC, abstractmethod
+from enum import IntEnum
+from typing import NamedTuple
 import numpy as np
+import cv2
+from utils.overlay import draw_skeleton
 
 
-@dataclass
-class Hand:
-    """Dataclass containing all the points at hand marked by mediapipe"""
+# Pairs of the points that are joined when a hand is drawn, the same as mediapipe.solutions.hands.HAND_CONNECTIONS. They are listed here so that mediapipe is only imported when a model is created.
+HAND_CONNECTIONS = frozenset(
+    (
+        *((0, 1), (0, 5), (0, 17), (5, 9), (9, 13), (13, 17)),  # Palm
+        *((1, 2), (2, 3), (3, 4)),  # Thumb
+        *((5, 6), (6, 7), (7, 8)),  # Index finger
+        *((9, 10), (10, 11), (11, 12)),  # Middle finger
+        *((13, 14), (14, 15), (15, 16)),  # Ring finger
+        *((17, 18), (18, 19), (19, 20)),  # Pinky
+    )
+)
+_CONNECTIONS = np.array(sorted(HAND_CONNECTIONS), dtype=np.int32)
+
+
+class HandLandmark(IntEnum):
+    """Indexes of the points at hand marked by mediapipe"""
 
     # The base of the hand, the point that connects all the fingers
-    WRIST: dict[str, list | tuple | dict]
+    WRIST = 0
 
     # Thumb
-    THUMB_CMC: dict[str, list | tuple | dict]  # Base of the thumb
-    THUMB_MCP: dict[str, list | tuple | dict]  # Metacarpophalangeal joint
-    THUMB_IP: dict[str, list | tuple | dict]  # Interphalangeal joint
-    THUMB_TIP: dict[str, list | tuple | dict]  # Tip of the thumb
+    THUMB_CMC = 1  # Base of the thumb
+    THUMB_MCP = 2  # Metacarpophalangeal joint
+    THUMB_IP = 3  # Interphalangeal joint
+    THUMB_TIP = 4  # Tip of the thumb
 
     # Index Finger
-    INDEX_FINGER_MCP: dict[str, list | tuple | dict]  # Metacarpophalangeal joint
-    INDEX_FINGER_PIP: dict[str, list | tuple | dict]  # Proximal joint
-    INDEX_FINGER_DIP: dict[str, list | tuple | dict]  # Distal joint
-    INDEX_FINGER_TIP: dict[str, list | tuple | dict]  # Tip of the index finger
+    INDEX_FINGER_MCP = 5  # Metacarpophalangeal joint
+    INDEX_FINGER_PIP = 6  # Proximal joint
+    INDEX_FINGER_DIP = 7  # Distal joint
+    INDEX_FINGER_TIP = 8  # Tip of the index finger
 
     # Middle Finger
-    MIDDLE_FINGER_MCP: dict[str, list | tuple | dict]  # Metacarpophalangeal joint
-    MIDDLE_FINGER_PIP: dict[str, list | tuple | dict]  # Proximal joint
-    MIDDLE_FINGER_DIP: dict[str, list | tuple | dict]  # Distal joint
-    MIDDLE_FINGER_TIP: dict[str, list | tuple | dict]  # Tip of the index finger
+    MIDDLE_FINGER_MCP = 9  # Metacarpophalangeal joint
+    MIDDLE_FINGER_PIP = 10  # Proximal joint
+    MIDDLE_FINGER_DIP = 11  # Distal joint
+    MIDDLE_FINGER_TIP = 12  # Tip of the middle finger
 
     # Ring Finger
-    RING_FINGER_MCP: dict[str, list | tuple | dict]  # Metacarpophalangeal joint
-    RING_FINGER_PIP: dict[str, list | tuple | dict]  # Proximal joint
-    RING_FINGER_DIP: dict[str, list | tuple | dict]  # Distal joint
-    RING_FINGER_TIP: dict[str, list | tuple | dict]  # Tip of the index finger
+    RING_FINGER_MCP = 13  # Metacarpophalangeal joint
+    RING_FINGER_PIP = 14  # Proximal joint
+    RING_FINGER_DIP = 15  # Distal joint
+    RING_FINGER_TIP = 16  # Tip of the ring finger
 
     # Pinky
-    PINKY_MCP: dict[str, list | tuple | dict]  # Metacarpophalangeal joint
-    PINKY_PIP: dict[str, list | tuple | dict]  # Proximal joint
-    PINKY_DIP: dict[str, list | tuple | dict]  # Distal joint
-    PINKY_TIP: dict[str, list | tuple | dict]  # Tip of the index finger
-
-
-class Hands:
-    # This function passes the mediapipe point and dimensions to the frame/image, then returns the 3D dimensional coordinates of this point based on the image.
-    __to_coord = lambda self, obj, shape: [
-        int(obj.x * 100 * (shape[1] / 100)),
-        int(obj.y * 100 * (shape[0] / 100)),
-        int(obj.z * 100),
-    ]
+    PINKY_MCP = 17  # Metacarpophalangeal joint
+    PINKY_PIP = 18  # Proximal joint
+    PINKY_DIP = 19  # Distal joint
+    PINKY_TIP = 20  # Tip of the pinky
+
+
+class Hand:
+    """All the points at hand marked by mediapipe.
+
+    The coordinates on the frame are kept in **landmarks**, a (21, 3) array indexed by **HandLandmark**: ``hand.landmarks[HandLandmark.WRIST]``.
+    Each point is also available by name in the ``hand.WRIST["coord"]`` form.
+    """
+
+    __slots__ = ("landmarks",)
+
+    def __init__(self, landmarks: np.ndarray):
+        """:param landmarks: A (21, 3) array with the x, y, z coordinates of every point on the frame"""
+        self.landmarks = landmarks
+
+    def coord(self, landmark: HandLandmark | int) -> np.ndarray:
+        """:return: The x, y, z coordinates of the point on the frame"""
+        return self.landmarks[landmark]
+
+
+def _landmarkAccessor(landmark: HandLandmark) -> property:
+    return property(
+        lambda self: {"coord": self.landmarks[landmark]},
+        doc=f"The {landmark.name} point in the ``{{'coord': [x, y, z]}}`` form",
+    )
+
+
+for _landmark in HandLandmark:
+    setattr(Hand, _landmark.name, _landmarkAccessor(_landmark))
+
+
+class TrackedHands(NamedTuple):
+    """Hands predicted by the tracker between two MediaPipe inferences, in the same form as the result of MediaPipe"""
+
+    multi_hand_landmarks: list[np.ndarray]  # (21, 3) arrays with normalized coordinates
+    multi_handedness: list  # The handedness found by the last inference
+
+
+class Classification(NamedTuple):
+    label: str
+    score: float
+
+
+class Handedness(NamedTuple):
+    """Handedness that did not come from MediaPipe, in the same form as the one it returns: ``handedness.classification[0].label``"""
+
+    classification: list[Classification]
+
+
+class BaseHands(ABC):
+    """The part of **Hands** that works on landmark arrays, shared by the classes that provide the hands without running MediaPipe in this process"""
+
     hands = None
 
-    def __init__(self):
-        """Interface for mediapipe, which allows working with mediapipe necessary to get the marked hand and the rib cords"""
+    @abstractmethod
+    def getHands(self, rgb_frame: np.ndarray):
+        """:param rgb_frame: A numpy matrix that contains the image frame (of type RGB)
+        :return: The hands found on the frame, None if there were none
+        """
+
+    def warmUp(self):
+        """Pays the initialization of the model before the first frame, nothing to do without a model in this process"""
+
+    def close(self):
+        """Frees the model"""
+
+    def drawOnFrame(self, frame: np.ndarray, hand_landmarks: np.ndarray):
+        """Add all points to marked hands on image frame
+
+        :param frame: A numpy array containing the image frame you want to place the landmarks on
+        :param hand_landmarks: A (21, 3) array with the normalized coordinates of the hand
+        """
+        # The hands are drawn in the same colors as mediapipe draws them
+        points = hand_landmarks[:, :2] * (frame.shape[1], frame.shape[0])
+        draw_skeleton(frame, points.astype(np.int32), _CONNECTIONS)
+
+    def landmarksToArray(self, hand_landmarks) -> np.ndarray:
+        """:return: A (21, 3) float array with the normalized x, y, z coordinates"""
+        return hand_landmarks
+
+    def getHand(self, hand_landmarks, frame_shape: list | tuple) -> Hand:
+        """Creates an instance of the **Hand** class.
+
+        :param hand_landmarks: list of landmarks. Example: **hands.multi_hand_landmarks[i]**; hands is returned by getHands.
+        :param frame_shape: A vector with 2 values, the width and height of the frame. Example: **frame.shape[:2]**
+        :return: Returns an instance of the Hand class
+        """
+        # The normalized coordinates are passed to the dimensions of the frame, z is kept in hundredths.
+        scale = np.array((frame_shape[1], frame_shape[0], 100), dtype=np.float32)
+
+        return Hand((self.landmarksToArray(hand_landmarks) * scale).astype(np.int32))
+
+
+class Hands(BaseHands):
+
+    def __init__(self, inference_interval: int = 1, motion_threshold: float = 0.02):
+        """Interface for mediapipe, which allows working with mediapipe necessary to get the marked hand and the rib cords
+
+        :param inference_interval: MediaPipe runs once every this many frames, on the frames in between the points of the hands are tracked with optical flow. 1 runs MediaPipe on every frame.
+        :param motion_threshold: If the tracked points move on average more than this fraction of the frame width between two frames, MediaPipe runs right away
+        """
+        # mediapipe takes a while to import, it is only loaded when a model is created
+        import mediapipe as mp
+
         self.__mp_hands = mp.solutions.hands
-        self.__mp_drawing = mp.solutions.drawing_utils
         self.__hands = self.__mp_hands.Hands(
             min_detection_confidence=0.7, min_tracking_confidence=0.7
         )
 
+        self.inference_interval = inference_interval
+        self.motion_threshold = motion_threshold
+        self.__frames_since_inference = 0
+        self.__previous_gray = None
+        self.__tracked = []
+        self.__handedness = []
+
+    def warmUp(self):
+        """Runs the model once on an empty frame, so that the first real frame does not pay the initialization of the graph"""
+        self.__hands.process(np.zeros((64, 64, 3), dtype=np.uint8))
+
+    def close(self):
+        self.__hands.close()
+
     def getHands(self, rgb_frame: np.ndarray):
         """It takes the frame, after which mediapipe processes it and finally returns an instance that contains all the data about the marked hand, including the coordinates
 
+        With an **inference_interval** above 1, on the frames without inference a **TrackedHands** is returned instead of the result of mediapipe.
+
         :param rgb_frame: A numpy matrix that contains the image frame (of type RGB) taken by Opencv
         :return: An instance that contains the parameters of the hand identified in the image/frame
         """
+        if self.inference_interval <= 1:
+            return self.__process(rgb_frame)
+
+        gray = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2GRAY)
+        self.__frames_since_inference += 1
+
+        track = self.__frames_since_inference < self.inference_interval
+
+        if track and self.__track(gray):
+            hands = (
+                TrackedHands(self.__tracked, self.__handedness)
+                if self.__tracked
+                else None
+            )
+
+        else:
+            hands = self.__process(rgb_frame)
+            self.__frames_since_inference = 0
+
+            if hands is not None:
+                self.__tracked = [
+                    self.landmarksToArray(hand_landmarks)
+                    for hand_landmarks in hands.multi_hand_landmarks
+                ]
+                self.__handedness = list(hands.multi_handedness)
+
+            else:
+                self.__tracked, self.__handedness = [], []
+
+        self.__previous_gray = gray
+        self.hands = hands
+
+        return hands
+
+    def __track(self, gray: np.ndarray) -> bool:
+        """Moves the points of the hands found by the last inference to the new frame using optical flow.
+
+        :param gray: The new frame in grayscale
+        :return: False if the points could not be tracked reliably or moved too much, then MediaPipe has to run
+        """
+        if self.__previous_gray is None or self.__previous_gray.shape != gray.shape:
+            return False
+
+        if not self.__tracked:
+            return True
+
+        size = np.array((gray.shape[1], gray.shape[0]), dtype=np.float32)
+        tracked = []
+
+        for landmarks in self.__tracked:
+            points = (landmarks[:, :2] * size).reshape(-1, 1, 2)
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(
+                self.__previous_gray,
+                gray,
+                points,
+                None,
+                winSize=(21, 21),
+                maxLevel=2,
+            )
+            found = status.ravel() == 1
+
+            if found.sum() < len(found) * 0.6:
+                return False
+
+            displacement = (moved - points).reshape(-1, 2)
+            # The points that were lost follow the others
+            displacement[~found] = np.median(displacement[found], axis=0)
+
+            if np.abs(displacement).mean() / size[0] > self.motion_threshold:
+                return False
+
+            landmarks = landmarks.copy()
+            landmarks[:, :2] += displacement / size
+            tracked.append(landmarks)
+
+        self.__tracked = tracked
+
+        return True
+
+    def __process(self, rgb_frame: np.ndarray):
+        """Runs MediaPipe on the frame"""
         hands = self.__hands.process(rgb_frame)
 
         if hands.multi_hand_landmarks:
@@ -81,64 +284,16 @@ class Hands:
         :param frame: A numpy array containing the image frame you want to place the landmarks on
         :param hand_landmarks: list of landmarks. Example: **hands.multi_hand_landmarks[i]**; hands is returned by getHands.
         """
-        self.__mp_drawing.draw_landmarks(
-            frame, hand_landmarks, self.__mp_hands.HAND_CONNECTIONS
-        )
+        super().drawOnFrame(frame, self.landmarksToArray(hand_landmarks))
 
-    def __getDictWithFingerPart(
-        self, hand_landmarks, frame_shape: list | tuple, part: str
-    ) -> dict:
+    def landmarksToArray(self, hand_landmarks) -> np.ndarray:
         """:param hand_landmarks: list of landmarks. Example: **hands.multi_hand_landmarks[i]**; hands is returned by getHands.
-        :param frame_shape: A vector with 2 values, the width and height of the frame. Example: **frame.shape[:2]**
-        :param part: Name of the part of the finger/hand that is present in the Hand dataclass
-        :return: Returns a dict containing the format at a point on the mediapipe and the coordinates themselves on the frame
-        """
-        return {
-            "mediapipe": hand_landmarks.landmark[
-                self.__mp_hands.HandLandmark.__dict__[part]
-            ],
-            "coord": self.__to_coord(
-                hand_landmarks.landmark[self.__mp_hands.HandLandmark.__dict__[part]],
-                frame_shape,
-            ),
-        }
-
-    def getHand(self, hand_landmarks, frame_shape: list | tuple) -> Hand:
-        """Creates an instance of the **Hand** dataclass.
-
-        :param hand_landmarks: list of landmarks. Example: **hands.multi_hand_landmarks[i]**; hands is returned by getHands.
-        :param frame_shape: A vector with 2 values, the width and height of the frame. Example: **frame.shape[:2]**
-        :return: Returns an instance of the Hand dataclass
+        :return: A (21, 3) float array with the normalized x, y, z coordinates returned by mediapipe
         """
-        hand_landmark_names = (
-            "WRIST",
-            "THUMB_CMC",
-            "THUMB_MCP",
-            "THUMB_IP",
-            "THUMB_TIP",
-            "INDEX_FINGER_MCP",
-            "INDEX_FINGER_PIP",
-            "INDEX_FINGER_DIP",
-            "INDEX_FINGER_TIP",
-            "MIDDLE_FINGER_MCP",
-            "MIDDLE_FINGER_PIP",
-            "MIDDLE_FINGER_DIP",
-            "MIDDLE_FINGER_TIP",
-            "RING_FINGER_MCP",
-            "RING_FINGER_PIP",
-            "RING_FINGER_DIP",
-            "RING_FINGER_TIP",
-            "PINKY_MCP",
-            "PINKY_PIP",
-            "PINKY_DIP",
-            "PINKY_TIP",
-        )
+        if isinstance(hand_landmarks, np.ndarray):
+            return hand_landmarks
 
-        hand = Hand(
-            **{
-                name: self.__getDictWithFingerPart(hand_landmarks, frame_shape, name)
-                for name in hand_landmark_names
-            }
+        return np.array(
+            [(point.x, point.y, point.z) for point in hand_landmarks.landmark],
+            dtype=np.float32,
         )
-
-        return hand
@@ -0,0 +1,280 @@
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from .hand_tracking import BaseHands, Classification, Handedness, TrackedHands
+
+
+def _worker(
+    memory_name: str,
+    slot_size: int,
+    tasks: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    min_detection_confidence: float,
+    min_tracking_confidence: float,
+):
+    """Runs MediaPipe in a separate process on the frames placed in the shared memory, until it receives None"""
+    import mediapipe as mp
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    hands = mp.solutions.hands.Hands(
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+    )
+    # The first inference initializes the graph, it is paid here instead of on the first frame
+    hands.process(np.zeros((64, 64, 3), dtype=np.uint8))
+    results.put(("ready", None, None, None, None))
+    frame = None
+
+    try:
+        while (task := tasks.get()) is not None:
+            slot, frame_id, shape = task
+            frame = np.ndarray(
+                shape, dtype=np.uint8, buffer=memory.buf, offset=slot * slot_size
+            )
+            start = time.perf_counter()
+            found = hands.process(frame)
+            duration = time.perf_counter() - start
+
+            landmarks, handedness = None, None
+            if found.multi_hand_landmarks:
+                # Only plain arrays and tuples go back, they are much smaller to send than the protobuf messages
+                landmarks = np.array(
+                    [
+                        [(point.x, point.y, point.z) for point in hand.landmark]
+                        for hand in found.multi_hand_landmarks
+                    ],
+                    dtype=np.float32,
+                )
+                handedness = [
+                    (hand.classification[0].label, hand.classification[0].score)
+                    for hand in found.multi_handedness
+                ]
+
+            results.put((slot, frame_id, landmarks, handedness, duration))
+
+    finally:
+        hands.close()
+        del frame
+        memory.close()
+
+
+class InferencePool(BaseHands):
+    def __init__(
+        self,
+        workers: int = 2,
+        slots: int | None = None,
+        min_detection_confidence: float = 0.7,
+        min_tracking_confidence: float = 0.7,
+        start_timeout: float = 30.0,
+        frame_size: tuple[int] = (1280, 720),
+        max_result_age: int | None = None,
+    ):
+        """Runs MediaPipe in worker processes so that the inference uses other cores than the frame loop. It replaces **Hands** in **CameraController**.
+
+        Each frame is copied into a free slot of a ring in shared memory and only the slot number goes to a worker; the workers send back the landmark arrays.
+        **getHands** does not wait for the inference: it returns the newest result that arrived, which belongs to a frame a little older than the current one.
+        When every slot is busy the frame is dropped instead of waiting, and results older than the one already returned are discarded.
+        A result is only returned for **max_result_age** frames; if no newer one arrives (a worker died, the ring stays full) **getHands** returns None, so a frozen hand does not keep controlling the drone.
+
+        :param workers: Number of processes running MediaPipe
+        :param slots: Number of frames that can be in the ring at once, by default twice the workers
+        :param start_timeout: Seconds to wait for the workers to load the model
+        :param frame_size: Width and height of the frames expected by **warmUp**, the slots are reallocated if a larger frame arrives
+        :param max_result_age: How many frames (submitted or dropped) after its own frame a result is still returned, by default twice the slots
+        """
+        self.workers = workers
+        self.slots = slots or workers * 2
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.start_timeout = start_timeout
+        self.frame_size = frame_size
+        self.max_result_age = max_result_age or self.slots * 2
+
+        self.frames_submitted = 0
+        self.dropped_frames = 0
+        self.stale_results = 0
+        self.result_frame_id = None  # Id of the frame the returned hands were found on
+        self.inference_time = 0.0  # Seconds the last inference took in its worker
+
+        self.__context = multiprocessing.get_context("spawn")
+        self.__memory = None
+        self.__slot_size = 0
+        self.__processes = []
+        self.__tasks = None
+        self.__results = None
+        self.__free = []
+        self.__next_id = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self.__processes)
+
+    @property
+    def pending(self) -> int:
+        """:return: How many frames are waiting for or going through the inference"""
+        return self.slots - len(self.__free) if self.running else 0
+
+    def warmUp(self):
+        """Starts the workers with slots for RGB frames of **frame_size**, so that the first **getHands** does not wait for them to load the model"""
+        if not self.running:
+            width, height = self.frame_size
+            self.start(width * height * 3)
+
+    def start(self, slot_size: int):
+        """Allocates the shared ring and starts the workers. It is called by **warmUp**, or by the first **getHands** without it.
+
+        :param slot_size: Size in bytes of the largest frame
+        """
+        self.close()
+
+        self.__slot_size = slot_size
+        self.__memory = shared_memory.SharedMemory(
+            create=True, size=slot_size * self.slots
+        )
+        self.__tasks = self.__context.Queue()
+        self.__results = self.__context.Queue()
+        self.__free = list(range(self.slots))
+
+        for _ in range(self.workers):
+            process = self.__context.Process(
+                target=_worker,
+                args=(
+                    self.__memory.name,
+                    slot_size,
+                    self.__tasks,
+                    self.__results,
+                    self.min_detection_confidence,
+                    self.min_tracking_confidence,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.__processes.append(process)
+
+        # The model is loaded before the first frame is accepted
+        for _ in range(self.workers):
+            self.__results.get(timeout=self.start_timeout)
+
+    def close(self, timeout: float = 2.0):
+        """Stops the workers and frees the shared memory"""
+        if not self.__processes:
+            return
+
+        for _ in self.__processes:
+            self.__tasks.put(None)
+
+        for process in self.__processes:
+            process.join(timeout)
+
+            if process.is_alive():
+                process.terminate()
+
+        self.__processes = []
+        self.__tasks.close()
+        self.__results.close()
+        self.__memory.close()
+        self.__memory.unlink()
+        self.__memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def submit(self, rgb_frame: np.ndarray) -> int | None:
+        """Copies the frame into a free slot and queues it for a worker.
+
+        :return: The id of the frame, None if it was dropped because every slot is busy
+        """
+        if not self.running or rgb_frame.nbytes > self.__slot_size:
+            self.start(rgb_frame.nbytes)
+
+        # A dropped frame takes an id too, so the age of the results keeps growing while the ring is full
+        frame_id = self.__next_id
+        self.__next_id += 1
+
+        if not self.__free:
+            self.dropped_frames += 1
+
+            return None
+
+        slot = self.__free.pop()
+
+        np.copyto(
+            np.ndarray(
+                rgb_frame.shape,
+                dtype=np.uint8,
+                buffer=self.__memory.buf,
+                offset=slot * self.__slot_size,
+            ),
+            rgb_frame,
+        )
+        self.__tasks.put((slot, frame_id, rgb_frame.shape))
+        self.frames_submitted += 1
+
+        return frame_id
+
+    def poll(self, timeout: float = 0.0) -> bool:
+        """Collects the results sent by the workers and keeps the newest one.
+
+        :param timeout: Seconds to wait for the first result
+        :return: True if a newer result arrived
+        """
+        updated = False
+
+        while self.running:
+            try:
+                result = (
+                    self.__results.get(timeout=timeout)
+                    if timeout
+                    else self.__results.get_nowait()
+                )
+
+            except queue.Empty:
+                return updated
+
+            timeout = 0.0
+            slot, frame_id, landmarks, handedness, duration = result
+            self.__free.append(slot)
+
+            # Several workers finish in any order, an older frame never replaces a newer one
+            if self.result_frame_id is not None and frame_id < self.result_frame_id:
+                self.stale_results += 1
+                continue
+
+            self.result_frame_id = frame_id
+            self.inference_time = duration
+            self.hands = (
+                TrackedHands(
+                    list(landmarks),
+                    [
+                        Handedness([Classification(label, score)])
+                        for label, score in handedness
+                    ],
+                )
+                if landmarks is not None
+                else None
+            )
+            updated = True
+
+        return updated
+
+    def getHands(self, rgb_frame: np.ndarray) -> TrackedHands | None:
+        """Queues the frame and returns the newest hands found by the workers, in the same form as **Hands.getHands**.
+
+        :param rgb_frame: A numpy matrix that contains the image frame (of type RGB)
+        :return: The hands of the newest processed frame, None if there were none or the result is too old
+        """
+        self.poll()
+        self.submit(rgb_frame)
+
+        if (
+            self.result_frame_id is None
+            or self.__next_id - 1 - self.result_frame_id > self.max_result_age
+        ):
+            self.hands = None
+
+        return self.hands
@@ -0,0 +1,117 @@
+import time
+import cv2
+import numpy as np
+from src.controllers.drone_controller import Telemetry
+
+
+class VideoFileSource:
+    def __init__(
+        self,
+        path: str,
+        resolution: list[int] | tuple[int] | None = None,
+        loop: bool = False,
+    ):
+        """Frame source for **CameraController** that reads a recorded video file instead of a camera.
+
+        :param path: Path to the video file
+        :param resolution: Width and height the frames are resized to, None keeps the recorded size
+        :param loop: If True, the video starts again from the beginning when it ends
+        """
+        self.path = path
+        self.resolution = tuple(resolution) if resolution else None
+        self.loop = loop
+        self.__capture = cv2.VideoCapture(path)
+
+        if not self.__capture.isOpened():
+            raise FileNotFoundError(f"Could not open the video file: {path}")
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.__capture.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    def __call__(self) -> np.ndarray | None:
+        ret, frame = self.__capture.read()
+
+        if not ret and self.loop:
+            self.__capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.__capture.read()
+
+        if not ret:
+            return None
+
+        if self.resolution and frame.shape[1::-1] != self.resolution:
+            frame = cv2.resize(frame, self.resolution, interpolation=cv2.INTER_AREA)
+
+        return frame
+
+    def release(self):
+        self.__capture.release()
+
+
+class FakeController:
+    def __init__(self, command_delay: float = 0.0):
+        """Stands in for the **Controller** class: it records the commands instead of sending them to a drone.
+
+        :param command_delay: How many seconds each flight command blocks, to imitate the round trip to the drone
+        """
+        self.command_delay = command_delay
+        self.commands = []  # (time.monotonic(), method name, parameters)
+        self.height = 0
+        self.battery = 100
+
+    def __record(self, name: str, *args):
+        self.commands.append((time.monotonic(), name, args))
+
+        if self.command_delay:
+            time.sleep(self.command_delay)
+
+    def get_telemetry(self, max_age: float | None = None) -> Telemetry:
+        return Telemetry(
+            timestamp=time.monotonic(),
+            height=self.height,
+            battery=self.battery,
+            pitch=0,
+            roll=0,
+            yaw=0,
+            flying=self.height > 0,
+        )
+
+    def get_battery(self) -> int:
+        return self.battery
+
+    def get_height(self) -> int:
+        return self.height
+
+    def run(self):
+        self.__record("run")
+        self.height = 80
+
+    def stop(self):
+        self.__record("stop")
+        self.height = 0
+
+    def move(self, direction: str, d: int | float):
+        self.__record("move", direction, d)
+
+    def move2(self, direction: str, d: int | float):
+        self.__record("move2", direction, d)
+
+    def rotate(self, direction: str, d: int | float):
+        self.__record("rotate", direction, d)
+
+    def rotate2(self, direction: str, d: int | float):
+        self.__record("rotate2", direction, d)
+
+    def send_rc(self, left_right: int, forward_back: int, up_down: int, yaw: int):
+        self.commands.append(
+            (time.monotonic(), "send_rc", (left_right, forward_back, up_down, yaw))
+        )
+
+    def go(self, x: int, y: int, z: int, speed: int):
+        self.__record("go", x, y, z, speed)
+
+    def curve(self, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int, speed: int):
+        self.__record("curve", x1, y1, z1, x2, y2, z2, speed)
+
+    def close(self):
+        pass
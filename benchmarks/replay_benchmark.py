@@ -0,0 +1,223 @@
+"""Replays recorded videos through the gesture pipeline and measures its speed.
+
+Usage (from the root of the repository):
+
+    python -m benchmarks.replay_benchmark --video hand.mp4 --output bench_results.json
+
+Every configuration runs the whole **CameraController** loop on the video, with a fake drone and without a window, and reports the frames per second, the latency percentiles of the main stages and the peak memory.
+The peak memory is measured in a second run of the same configuration, because allocation tracing slows down the Python code of the loop.
+"""
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from ai_core.vision import Hands
+from src.controllers import CameraController
+from utils.profiling import StageProfiler
+from benchmarks.fakes import FakeController, VideoFileSource
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# The configurations compared by default
+CONFIGURATIONS = {
+    "full": dict(show_landmarks=True, show_minimap=True),
+    "no_overlays": dict(show_landmarks=False, show_minimap=False),
+    "minimap_only": dict(show_landmarks=False, show_minimap=True),
+    "640x360": dict(show_landmarks=True, show_minimap=True, resolution=(640, 360)),
+    "tracking_3": dict(show_landmarks=True, show_minimap=True, inference_interval=3),
+}
+
+
+def build_camera(
+    source: VideoFileSource,
+    drone: FakeController,
+    show_landmarks: bool,
+    show_minimap: bool,
+    inference_interval: int,
+    max_frames: int | None,
+) -> CameraController:
+    """:return: A **CameraController** that runs the whole pipeline on the source without a window"""
+    camera = CameraController(
+        get_frame_function=source,
+        drone_controller=drone,
+        show_information=True,
+        show_minimap=show_minimap,
+        show_landmarks=show_landmarks,
+        max_frames=max_frames,
+        hands=Hands(inference_interval=inference_interval),
+    )
+    # The measured quality must not change during the run
+    camera.governor.enabled = False
+    # The frames are rendered as usual, only the window is skipped
+    camera.showFrame = lambda: True
+
+    return camera
+
+
+def run_configuration(
+    video: str,
+    name: str,
+    show_landmarks: bool = True,
+    show_minimap: bool = True,
+    resolution: tuple[int] | None = None,
+    inference_interval: int = 1,
+    max_frames: int | None = None,
+    command_delay: float = 0.0,
+    measure_memory: bool = True,
+) -> dict:
+    """Runs the pipeline on the whole video with one configuration.
+
+    :param measure_memory: If True, the configuration runs a second time with tracemalloc to find the peak memory
+    :return: The measurements of the run
+    """
+    source = VideoFileSource(video, resolution=resolution)
+
+    # Some containers do not know their length, then the run ends when the frames stop coming
+    if source.frame_count > 0:
+        max_frames = min(max_frames or source.frame_count, source.frame_count)
+
+    drone = FakeController(command_delay=command_delay)
+    camera = build_camera(
+        source, drone, show_landmarks, show_minimap, inference_interval, max_frames
+    )
+    # The built-in stage timers keep every measurement of the run
+    camera.profiler = StageProfiler(enabled=True, window=max_frames or 100_000)
+
+    start = time.perf_counter()
+    camera.running()
+    elapsed = time.perf_counter() - start
+    source.release()
+
+    peak = None
+    if measure_memory:
+        source = VideoFileSource(video, resolution=resolution)
+        memory_camera = build_camera(
+            source,
+            FakeController(command_delay=command_delay),
+            show_landmarks,
+            show_minimap,
+            inference_interval,
+            max_frames,
+        )
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_camera.running()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        source.release()
+
+    stats = camera.stats()
+
+    return {
+        "name": name,
+        "video": video,
+        "resolution": list(resolution) if resolution else None,
+        "show_landmarks": show_landmarks,
+        "show_minimap": show_minimap,
+        "inference_interval": inference_interval,
+        "frames": camera.frames_processed,
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(camera.frames_processed / elapsed, 2) if elapsed else 0.0,
+        "hands_detected": camera.hands_detected,
+        "commands_issued": len(drone.commands),
+        "frame_latency_ms": {
+            key: stats[key]
+            for key in ("latency_ms_mean", "latency_ms_p50", "latency_ms_p95")
+            if key in stats
+        },
+        "stages": camera.profiler.snapshot()["stages"],
+        "peak_traced_memory_mb": round(peak / 2**20, 2) if peak is not None else None,
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+def max_rss_mb() -> float | None:
+    """:return: The peak resident memory of the whole process, it never decreases between runs"""
+    if resource is None:
+        return None
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return round(max_rss / (2**20 if platform.system() == "Darwin" else 2**10), 2)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--video",
+        action="append",
+        required=True,
+        help="Recorded video, can be repeated",
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        choices=sorted(CONFIGURATIONS),
+        help="Configuration to run, can be repeated. By default all of them run.",
+    )
+    parser.add_argument("--max-frames", type=int, help="Frames processed per run")
+    parser.add_argument(
+        "--command-delay",
+        type=float,
+        default=0.0,
+        help="Seconds each fake drone command blocks",
+    )
+    parser.add_argument(
+        "--skip-memory",
+        action="store_true",
+        help="Do not run each configuration a second time to measure the peak memory",
+    )
+    parser.add_argument(
+        "--output", default="bench_results.json", help="JSON file with the results"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = []
+
+    for video in args.video:
+        for name in args.config or CONFIGURATIONS:
+            result = run_configuration(
+                video,
+                name,
+                max_frames=args.max_frames,
+                command_delay=args.command_delay,
+                measure_memory=not args.skip_memory,
+                **CONFIGURATIONS[name],
+            )
+            results.append(result)
+            peak = result["peak_traced_memory_mb"]
+            print(
+                f"{name:<14} {result['fps']:>8.2f} fps  "
+                f"{result['frame_latency_ms'].get('latency_ms_p95', 0):>8.2f} ms p95  "
+                + (f"{peak:>8.2f} MB peak" if peak is not None else "")
+            )
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            file,
+            indent=4,
+        )
+
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
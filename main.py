@@ -1,8 +1,17 @@
+import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
 import cv2
 import numpy as np
 from utils import file_manager
+from utils.camera_discovery import validate_camera
+from utils.timing import StartupTimer
+from ai_core.vision import BaseHands
 from src.controllers import Controller
 from src.controllers import CameraController
+from src.controllers.camera_controller import create_hands
+from src.controllers.ffmpeg_source import FFmpegFrameSource
+from src.controllers.swarm import Swarm
+from src.controllers.session_recorder import ReplayHands, SessionRecorder, SessionReplay
 
 
 config_path = "data/config.json"
@@ -18,34 +27,185 @@ def get_frame(capture: cv2.VideoCapture) -> np.ndarray:
     return frame
 
 
+def load_hands(config: dict, startup: StartupTimer) -> BaseHands:
+    """Imports MediaPipe, creates the model and runs it once, so that the first frame does not wait for it"""
+    with startup.step("hands"):
+        hands = create_hands(config)
+        hands.warmUp()
+
+    return hands
+
+
+def wait_hands(future: Future, startup: StartupTimer) -> BaseHands:
+    with startup.step("waiting_for_hands"):
+        return future.result()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Control Tello drones using hand gestures")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run without a window and print throughput and latency stats (also set by 'headless' in the config)",
+    )
+    parser.add_argument("--max-frames", type=int, help="Stop after this many frames")
+    parser.add_argument("--max-seconds", type=float, help="Stop after this many seconds")
+    parser.add_argument(
+        "--stats-interval", type=float, help="Seconds between two stats lines"
+    )
+    parser.add_argument("--record", metavar="DIR", help="Record the session into this directory")
+    parser.add_argument(
+        "--record-landmarks-only",
+        action="store_true",
+        help="Record only the hands, gestures and commands, without the frames",
+    )
+    parser.add_argument(
+        "--replay", metavar="DIR", help="Replay a recorded session instead of the camera"
+    )
+    parser.add_argument(
+        "--replay-landmarks",
+        action="store_true",
+        help="Replay the recorded hands without running MediaPipe",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Replay at the recorded timing instead of as fast as possible",
+    )
+
+    return parser.parse_args()
+
+
 def main():
-    config = file_manager.open_json(config_path)
-    controller = Controller() if config["connect_drone"] else None
+    startup = StartupTimer()
+    args = parse_args()
+
+    with startup.step("config"):
+        config = file_manager.open_json(config_path)
+
+    # The model is loaded in the background while the drone connects and the camera opens
+    hands_future = None
+    if not (args.replay and args.replay_landmarks):
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LoadHands")
+        hands_future = loader.submit(load_hands, config, startup)
+        loader.shutdown(wait=False)
+
+    controller = None
+    if config["connect_drone"]:
+        # With several drones in the config, the gestures control all of them at once
+        with startup.step("drone"):
+            controller = (
+                Swarm(config["swarm"])
+                if config.get("swarm")
+                else Controller(**config.get("drone", {}))
+            )
+
+    recorder = (
+        SessionRecorder(args.record, record_frames=not args.record_landmarks_only)
+        if args.record
+        else None
+    )
+
+    options = dict(
+        show_information=True,
+        show_minimap=True,
+        show_landmarks=True,
+        threaded_capture=config.get("threaded_capture", False),
+        threaded_display=config.get("threaded_display", False),
+        headless=args.headless or config.get("headless", False),
+        max_frames=args.max_frames,
+        max_seconds=args.max_seconds,
+        stats_interval=args.stats_interval,
+        recorder=recorder,
+        startup=startup,
+    )
+
+    frame_source = None
 
     # If the controller is not exist, the image from the simple camera will be captured, and the controller with the camera will be started without sending any commands to the drone.
-    if controller is not None and config["camera"] == "drone":
-        controller.run_camera()
+    if args.replay:
+        replay = SessionReplay(
+            args.replay, realtime=args.realtime, landmarks_only=args.replay_landmarks
+        )
+        # Every recorded frame has to be processed, so the replay is read on the loop thread
+        options.update(
+            threaded_capture=False,
+            max_frames=min(args.max_frames or replay.frame_count, replay.frame_count),
+        )
+        camera_controller = CameraController(
+            get_frame_function=replay,
+            drone_controller=controller,
+            hands=(
+                ReplayHands(replay)
+                if args.replay_landmarks
+                else wait_hands(hands_future, startup)
+            ),
+            **options,
+        )
+
+    elif controller is not None and config["camera"] == "drone":
+        # ffmpeg decodes the stream in its own process and the frames are read from its pipe without new allocations
+        if config.get("video_backend") == "ffmpeg":
+            ffmpeg_config = config.get("ffmpeg", {})
+
+            with startup.step("camera"):
+                controller.run_camera(frame_read=False)
+                frame_source = get_frame_function = FFmpegFrameSource(
+                    url=ffmpeg_config.get("url", "udp://0.0.0.0:11111"),
+                    pixel_format="rgb24",
+                    ffmpeg=ffmpeg_config.get("path"),
+                )
+                # A missing ffmpeg is reported here instead of on the first frame
+                frame_source.start()
+            # The source already reads on its own thread, and its buffers are reused once the next frame is taken
+            options["threaded_capture"] = False
+
+        else:
+            with startup.step("camera"):
+                controller.run_camera()
+            get_frame_function = controller.get_capture
+
         camera_controller = CameraController(
-            get_frame_function=controller.get_capture,
+            get_frame_function=get_frame_function,
             drone_controller=controller,
-            show_information=True,
-            show_minimap=True,
-            show_landmarks=True,
+            hands=wait_hands(hands_future, startup),
+            **options,
         )
 
     elif config["camera"] != "drone" and type(config["camera"]) is int:
-        capture = cv2.VideoCapture(config["camera"])
+        with startup.step("camera"):
+            camera = validate_camera(config["camera"])
+            capture = cv2.VideoCapture(config["camera"]) if camera else None
+
+        if capture is None:
+            print(
+                f"ERROR: The camera {config['camera']} is not available, choose another one with verify_camera.py"
+            )
+
+            return
+
         camera_controller = CameraController(
             get_frame_function=get_frame,
             drone_controller=controller,
-            show_information=True,
-            show_minimap=True,
-            show_landmarks=True,
             capture=capture,
+            hands=wait_hands(hands_future, startup),
+            **options,
         )
 
     camera_controller.running()
 
+    if hands_future is not None:
+        hands_future.result().close()
+
+    if frame_source is not None:
+        frame_source.stop()
+
+    if recorder is not None:
+        recorder.close()
+
+    if controller is not None:
+        controller.close()
+
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,22 @@
-from .drone_controller import Controller
-from .component import Minimap
-from .camera_controller import CameraController
+import importlib
+
+# The classes are imported the first time they are used, so importing one of them does not load the libraries of the others
+_LAZY = {
+    "Controller": ".drone_controller",
+    "Minimap": ".component",
+    "CameraController": ".camera_controller",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY])
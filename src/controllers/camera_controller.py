@@ -1,19 +1,59 @@
 import cv2
 import numpy as np
 import asyncio
+import json
+import signal
+import time
+from collections import deque
 from typing import Callable
 from utils import file_manager
-from ai_core.vision import Hand, Hands
-from src.controllers import Controller, Minimap
+from utils.timing import FpsCounter, StartupTimer
+from utils.preprocessing import FramePreprocessor
+from utils.profiling import MetricsExporter, StageProfiler
+from utils.overlay import OverlayRenderer
+from ai_core.vision import (
+    HAND_CONNECTIONS,
+    BaseHands,
+    Gesture,
+    GestureDebouncer,
+    GestureRecognizer,
+    Hand,
+    HandLandmark,
+    Hands,
+    InferencePool,
+)
+from src.controllers.component import Minimap
+from src.controllers.drone_controller import Controller
+from src.controllers.frame_grabber import FrameGrabber
+from src.controllers.display import FrameDisplay
+from src.controllers.command_executor import CommandExecutor
+from src.controllers.governor import QualityGovernor
+from src.controllers.path_compiler import CompiledPath, PathCompiler
+from src.controllers.rc_stream import RCMapper, RCStreamer
+from src.controllers.swarm import Swarm
+from src.controllers.session_recorder import SessionRecorder
 
 
 config_path = "data/config.json"
 
 
+def create_hands(config: dict) -> BaseHands:
+    """Creates the hand detector chosen in the config.
+
+    :param config: The content of **data/config.json**
+    :return: An **InferencePool** when **inference_workers** is above 0, otherwise **Hands**
+    """
+    if config.get("inference_workers", 0) > 0:
+        # MediaPipe runs in separate processes and the loop takes the newest result
+        return InferencePool(workers=config["inference_workers"])
+
+    return Hands(
+        inference_interval=config.get("inference_interval", 1),
+        motion_threshold=config.get("motion_threshold", 0.02),
+    )
+
+
 class CameraController:
-    __path = (
-        []
-    )  # This list contains the commands that will be executed by the drone one by one.
     _run = False
     __start = False
     __started = False
@@ -22,11 +62,21 @@ class CameraController:
     def __init__(
         self,
         get_frame_function: Callable[[], np.ndarray],
-        drone_controller: Controller | None = None,
+        drone_controller: Controller | Swarm | None = None,
         show_information: bool = True,
         show_minimap: bool = True,
         show_landmarks: bool = True,
         *args,
+        threaded_capture: bool = False,
+        capture_buffer_size: int = 1,
+        threaded_display: bool = False,
+        headless: bool = False,
+        max_frames: int | None = None,
+        max_seconds: float | None = None,
+        stats_interval: float | None = None,
+        hands: BaseHands | None = None,
+        recorder: SessionRecorder | None = None,
+        startup: StartupTimer | None = None,
         **kwargs,
     ):
         """Interface for controlling the drone using hand gestures.
@@ -35,7 +85,7 @@ class CameraController:
         The drone recognizes specific hand gestures, which are translated into commands.
         - **Only the right hand** can be used to perform these gestures.
         - **"Wait"**, **"Start"** and **"Stop"** commands execute instantly.
-        - **"Move"** and **"Rotate"** commands are queued and executed sequentially once the **"Start"** command is given again while the drone is flying.
+        - **"Move"** and **"Rotate"** commands are queued once the **"Start"** command is given again while the drone is flying. By default the drone then flies straight to the end of the queued path and turns to its final heading; with **waypoints** in the **path_compiler** config it passes through the end of every queued move.
 
         #### 1. **"Wait" Command ✋**
         - **Gesture**: Vertical palm in front of the camera, with the thumb pressed against the palm.
@@ -64,22 +114,132 @@ class CameraController:
         - **Action**: The drone will stop and land.
 
         :param get_frame_function: Custom function that should return the frame with the image taken from the video camera.
-        :param drone_controller: Instance of the **Controller** class.
+        :param drone_controller: Instance of the **Controller** class, or a **Swarm** to control several drones with the same gestures.
+        :param threaded_capture: If True, the frames are read on a background thread and the processing loop always takes the newest one
+        :param capture_buffer_size: How many frames the background capture keeps before dropping the oldest ones
+        :param threaded_display: If True, the window is updated on a background thread that shows the newest processed frame, so the loop does not wait for imshow and waitKey. It is ignored on macOS, where the window has to stay on the main thread
+        :param headless: If True, no window is created and nothing is drawn on the frames. The loop stops on SIGINT/SIGTERM or at the frame/time limit.
+        :param max_frames: The loop stops after processing this many frames
+        :param max_seconds: The loop stops after running this many seconds
+        :param stats_interval: Every this many seconds a JSON line with the throughput and latency stats is printed. By default only in headless mode, every 5 seconds.
+        :param hands: Instance of the **Hands** class (or another **BaseHands**) used to find the hands, by default one is created from the config
+        :param recorder: Instance of the **SessionRecorder** class that records the frames, the hands, the gestures and the drone commands
+        :param startup: The timer of the startup steps. The time until the first processed frame is added to it and the breakdown is printed as a JSON line.
         :param ...: Any other parameter will be as a parameter for **get_frame_function**
         """
         self.__get_frame_function = get_frame_function
         self.__func_params = [args, kwargs]
+        self.__path = []  # This list contains the commands that will be executed by the drone one by one.
+        self.__frame_grabber = (
+            FrameGrabber(get_frame_function, capture_buffer_size, *args, **kwargs)
+            if threaded_capture
+            else None
+        )
+        self.processing_fps = FpsCounter()
+        self.headless = headless
+        self.__display = (
+            FrameDisplay()
+            if threaded_display and not headless and FrameDisplay.supported()
+            else None
+        )
+        self.max_frames, self.max_seconds = max_frames, max_seconds
+        self.stats_interval = (
+            stats_interval if stats_interval is not None or not headless else 5.0
+        )
+        self.frames_processed = 0
+        self.hands_detected = 0
+        self.__latencies = deque(maxlen=300)
+        self.__started_at = None
         self.__drone_controller = drone_controller
+        # The drone commands block until the drone answers, so they are executed on a separate thread and the frame loop only queues them.
+        self.__executor = (
+            CommandExecutor(drone_controller) if drone_controller else None
+        )
         self.show_information, self.show_minimap, self.show_landmarks = (
             show_information,
             show_minimap,
             show_landmarks,
         )
 
-        self.__hands = Hands()
         self.config = file_manager.open_json(filename=config_path)
+        # The hands created here are also closed here, the ones passed in belong to the caller
+        self.__owns_hands = hands is None
+        if hands is None:
+            hands = create_hands(self.config)
+
+        self.__hands = hands
+        self.recorder = recorder
+        self.startup = startup
+
+        # OpenCV captures the image from the drone in RGB format, which is why it needs to be converted to BGR to ensure the image is displayed correctly.
+        self.__preprocessor = FramePreprocessor(
+            source_rgb=self.config["camera"] == "drone"
+        )
 
+        # Lowers the inference resolution, the loop rate and the overlays when the frames take longer than the budget.
+        governor_config = self.config.get("quality_governor", {})
+        self.governor = QualityGovernor(
+            latency_budget_ms=governor_config.get("latency_budget_ms", 60),
+            enabled=governor_config.get("enabled", False),
+        )
+
+        # Timers of the stages of the loop, disabled by default because the HUD and the exports are only needed while tuning.
+        profiling_config = self.config.get("profiling", {})
+        self.profiler = StageProfiler(
+            enabled=profiling_config.get("enabled", False),
+            window=profiling_config.get("window", 300),
+        )
+        self.show_profiling = profiling_config.get("hud", False)
+        export_config = profiling_config.get("export") or {}
+        self.__metrics_exporter = (
+            MetricsExporter(
+                target=export_config["target"],
+                format=export_config.get("format", "jsonl"),
+                interval=export_config.get("interval_s", 5.0),
+            )
+            if self.profiler.enabled and export_config.get("target")
+            else None
+        )
+
+        # Merges the queued moves and rotations into a few go commands, without it every entry of the path is sent as it is.
+        path_config = dict(self.config.get("path_compiler", {}))
+        self.path_compiler = (
+            PathCompiler(**path_config) if path_config.pop("enabled", False) else None
+        )
+        self.compiled_path: CompiledPath | None = None  # The last path sent to the drone
+
+        # In the live mode the move and rotate gestures steer the drone through the rc sticks while they are shown, instead of being queued in the path.
+        rc_config = self.config.get("rc_control", {})
+        self.rc_streamer = (
+            RCStreamer(
+                drone_controller,
+                rate=rc_config.get("rate_hz", 30),
+                deadman_timeout=rc_config.get("deadman_s", 0.3),
+                max_step=rc_config.get("max_step", 25),
+            )
+            if drone_controller is not None and rc_config.get("enabled", False)
+            else None
+        )
+        self.rc_mapper = RCMapper(
+            gain=rc_config.get("gain", 250),
+            dead_zone=rc_config.get("dead_zone", 0.05),
+            max_speed=rc_config.get("max_speed", 60),
+        )
+
+        # Everything drawn over the frame is collected during the iteration and drawn at once before the frame is shown
+        self.overlay = OverlayRenderer(HAND_CONNECTIONS)
         self.minimap = Minimap()
+        # New gestures can be added with gestures.register, the gestures that are not handled here are kept as the current command.
+        self.gestures = GestureRecognizer()
+        # A gesture has to be seen on several recent frames before it changes the command, so a misclassified frame does not make the drone take off or land.
+        debounce_config = self.config.get("gesture_debounce", {})
+        self.debouncer = GestureDebouncer(
+            window=debounce_config.get("window", 5),
+            confirm=debounce_config.get("confirm", 3),
+            release=debounce_config.get("release", 3),
+            confirm_frames=debounce_config.get("confirm_frames"),
+        )
+        self.min_path_delta = debounce_config.get("min_delta_px", 3)
 
     def updateFrame(self, frame: np.ndarray):
         """Updates the global frame of the instance
@@ -93,45 +253,196 @@ class CameraController:
         """Create a window with the video stream from the global frame of the instance via OpenCV.
 
         **To close the window, respectively this interface, it is necessary to press the _Q_ button**
+
+        With a **Swarm**, the keys _1_-_9_ send the next commands only to that drone and _0_ to all of them.
+
+        With the display thread, the frame is only handed over to it and the keys pressed since the previous frame are handled here.
         """
-        cv2.imshow("Video Capture", self.__frame)
+        if self.__display is not None:
+            self.__display.show(self.__frame)
+            keys = self.__display.keys()
+
+        else:
+            cv2.imshow("Video Capture", self.__frame)
+            keys = [cv2.waitKey(1) & 0xFF]
+
+        for key in keys:
+            self.__handleKey(key)
+
+        return self.__run
 
-        if cv2.waitKey(1) & 0xFF == ord("q"):
+    def __handleKey(self, key: int):
+        if key == ord("q"):
             self.__run = False
 
-            return self.__run
+        elif isinstance(self.__drone_controller, Swarm) and ord("0") <= key <= ord("9"):
+            try:
+                self.__drone_controller.select(key - ord("0"))
 
-        return True
+            except ValueError:  # There is no drone with that number
+                pass
+
+    @property
+    def capture_fps(self) -> float:
+        """:return: The rate at which frames are captured. Without the background capture it is the same as the processing rate."""
+        if self.__frame_grabber is not None:
+            return self.__frame_grabber.capture_fps.fps
+
+        return self.processing_fps.fps
+
+    def readFrame(self) -> np.ndarray | None:
+        """Retrieves the next frame, either from the background capture or directly through the custom function"""
+        if self.__frame_grabber is not None:
+            frame = self.__frame_grabber.read()
+
+            return frame[1] if frame is not None else None
+
+        return self.__get_frame_function(*self.__func_params[0], **self.__func_params[1])
+
+    def stats(self) -> dict:
+        """:return: Throughput and latency of the frame loop"""
+        elapsed = (
+            time.perf_counter() - self.__started_at if self.__started_at else 0.0
+        )
+        stats = {
+            "elapsed_s": round(elapsed, 3),
+            "frames": self.frames_processed,
+            "hands_detected": self.hands_detected,
+            "capture_fps": round(self.capture_fps, 2),
+            "processing_fps": round(self.processing_fps.fps, 2),
+            "dropped_frames": (
+                self.__frame_grabber.dropped_frames if self.__frame_grabber else 0
+            ),
+            "quality_level": self.governor.level_index,
+            "display_dropped_frames": (
+                self.__display.dropped_frames if self.__display else 0
+            ),
+        }
+
+        if self.__latencies:
+            latencies = np.array(self.__latencies) * 1000
+            stats["latency_ms_mean"] = round(float(latencies.mean()), 3)
+            stats["latency_ms_p50"] = round(float(np.percentile(latencies, 50)), 3)
+            stats["latency_ms_p95"] = round(float(np.percentile(latencies, 95)), 3)
+
+        return stats
+
+    def stop(self, *_):
+        """Stops the loop after the current frame. It can be used as a signal handler."""
+        self.__run = False
+
+    def __limitReached(self) -> bool:
+        if self.max_frames is not None and self.frames_processed >= self.max_frames:
+            return True
+
+        return (
+            self.max_seconds is not None
+            and time.perf_counter() - self.__started_at >= self.max_seconds
+        )
+
+    def displayInformation(
+        self, text: str, position: list[int] | tuple[int], cache: bool = True
+    ):
+        """:param cache: False for a text that changes often, see **OverlayRenderer.text**"""
+        if (
+            not self.headless
+            and self.show_information
+            and self.governor.level.show_information
+        ):
+            self.overlay.text(text, position, cache=cache)
 
-    def displayInformation(self, text: str, position: list[int] | tuple[int]):
-        if self.show_information:
-            cv2.putText(
-                self.__frame,
-                text,
-                position,
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
-                (0, 0, 255),
-                2,
+    def __displayProfiling(self):
+        """Draws the percentiles of the stages and the counters of the profiler in the top left corner"""
+        if self.headless or not self.show_profiling or not self.profiler.enabled:
+            return
+
+        for i, line in enumerate(self.profiler.hudLines()):
+            self.overlay.text(
+                line, (10, 80 + i * 15), (0, 255, 255), 0.4, 1, cache=False
             )
 
+    def __targets(self) -> dict:
+        """:return: The drones of a swarm selected now, as keyword parameters of the command, so a later selection does not redirect it"""
+        if isinstance(self.__drone_controller, Swarm):
+            return {"targets": self.__drone_controller.selected}
+
+        return {}
+
+    def __submit(self, name: str, *args, **kwargs):
+        """Queues a drone command for the drones selected now and counts it"""
+        self.profiler.count("commands_issued")
+        kwargs = {**self.__targets(), **kwargs}
+
+        if self.recorder is not None:
+            self.recorder.recordEvent("command", name, *args)
+
+        return self.__executor.submit(name, *args, **kwargs)
+
+    def __addToPath(self, action: str, hand: Hand):
+        """Adds to the path the distance the index finger moved since the previous frame, as long as the same action is shown.
+
+        :param action: move or rotate
+        """
+        index_tip_x = int(hand.landmarks[HandLandmark.INDEX_FINGER_TIP, 0])
+
+        if self.__command and self.__command[0] == action:
+            distance = index_tip_x - self.__command[1]
+
+            # The jitter of the landmarks is not added, the reference stays until the finger really moves
+            if abs(distance) < self.min_path_delta:
+                return
+
+            if self.__path and self.__path[-1][0] == action:
+                self.__path[-1][1] += distance
+                self.displayInformation(
+                    f"{self.__path[-1][1]}",
+                    (120, 50),
+                    cache=False,
+                )
+
+            else:
+                self.__path.append([action, distance])
+
+            self.minimap.addToPath(action=[action, distance])
+
+        self.__command = [action, index_tip_x]
+
     def __runPath(self):
-        """Iterates through each element in **self.__path** and then executes the indicated command, finally emptying the list"""
-        if self.commandToDrone(command="fly?") is True:
+        """Iterates through each element in **self.__path** and then queues the indicated command, finally emptying the list"""
+        # The previous commands have to finish first, otherwise the height is not reliable
+        if self.commandToDrone(command="busy?"):
+            return
+
+        flying = self.commandToDrone(command="fly?")
+
+        # Without recent telemetry the path is kept until it is known whether the drone is flying
+        if flying is None:
+            return
+
+        if flying and self.path_compiler:
+            self.compiled_path = self.path_compiler.compile(self.__path)
+
+            for command in self.compiled_path.commands:
+                self.__submit(command.name, *command.args)
+
+            self.profiler.count("path_commands", len(self.compiled_path.commands))
+            self.profiler.count("path_entries", len(self.__path))
+
+        elif flying:
             for action in self.__path:
                 if action[0] == "move":
                     if action[1] > 0:  # Move forward
-                        self.__drone_controller.move("forward", action[1])
+                        self.__submit("move", "forward", action[1])
 
                     else:  # Move back
-                        self.__drone_controller.move("back", abs(action[1]))
+                        self.__submit("move", "back", abs(action[1]))
 
                 elif action[0] == "rotate":
                     if action[1] > 0:  # Rotate left
-                        self.__drone_controller.rotate("left", action[1])
+                        self.__submit("rotate", "left", action[1])
 
                     else:  # Rotate right
-                        self.__drone_controller.rotate("right", abs(action[1]))
+                        self.__submit("rotate", "right", abs(action[1]))
 
         else:
             self.commandToDrone(command='start')
@@ -142,57 +453,148 @@ class CameraController:
     def commandToDrone(self, command: str = "") -> bool:
         """Execute special interface commands to control the drone
 
-        :param command: The command you want to execute. Available commands: start, stop, fly?, run-path
+        The **start** and **stop** commands are only queued, **stop** has the emergency priority and cancels everything still waiting in the queue.
+
+        :param command: The command you want to execute. Available commands: start, stop, fly?, busy?
         """
         if not self.__drone_controller:
             return None
 
         if command == "start":
-            self.__drone_controller.run()
+            self.__submit("run")
 
         elif command == "stop":
-            self.__drone_controller.stop()
+            self.__submit(
+                "stop", priority=CommandExecutor.PRIORITY_EMERGENCY
+            )
+
+        elif command == "busy?":
+            return self.__executor.busy
 
         elif command == "fly?":
-            height = self.__drone_controller.get_height()
+            telemetry = self.__drone_controller.get_telemetry()
 
-            if height > 0:
-                return True
-            else:
-                return False
+            # Without recent telemetry it is not known whether the drone is flying
+            if telemetry is None:
+                return None
+
+            return telemetry.flying
 
         return True
 
     def running(self):
         """It starts a cycle through which it processes the video stream captured by the camera and performs certain checks for the classification of hand gestures and the control of the drone."""
-        self.__run, retry = True, 0
+        self.__run = True
+        self.__started_at = time.perf_counter()
+        handlers = {}
+
+        # Without a window there is no Q button, the loop is stopped with Ctrl+C or a termination signal.
+        if self.headless:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    handlers[signum] = signal.signal(signum, self.stop)
 
-        while self.__run:
+                except ValueError:  # Signals can only be handled on the main thread
+                    pass
+
+        if self.__frame_grabber is not None:
+            self.__frame_grabber.start()
+
+        if self.__display is not None:
+            self.__display.start()
+
+        if self.__executor is not None:
+            self.__executor.start()
+
+        if self.rc_streamer is not None:
+            self.rc_streamer.start()
+
+        try:
+            self.__loop()
+
+        finally:
+            if self.__frame_grabber is not None:
+                self.__frame_grabber.stop()
+
+            if self.__display is not None:
+                self.__display.stop()
+
+            if self.rc_streamer is not None:
+                self.rc_streamer.stop()
+
+            if self.__executor is not None:
+                self.__executor.stop()
+
+            if self.__metrics_exporter is not None:
+                self.__metrics_exporter.export(self.profiler)
+                self.__metrics_exporter.close()
+
+            if self.recorder is not None:
+                self.recorder.flush()
+
+            if self.__owns_hands:
+                self.__hands.close()
+
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+            if self.stats_interval:
+                print(json.dumps(self.stats()), flush=True)
+
+    def __loop(self):
+        retry = 0
+        last_stats = time.perf_counter()
+
+        profiler = self.profiler
+
+        while self.__run and not self.__limitReached():
             # Retrieve the frame through the custom function and use it as a global parameter of the instance
-            self.updateFrame(
-                self.__get_frame_function(
-                    *self.__func_params[0], **self.__func_params[1]
-                )
-            )
+            with profiler.stage("capture"):
+                self.updateFrame(self.readFrame())
 
             if self.__frame is None:
                 retry += 1
+                profiler.count("frames_missed")
 
-                continue
+                # The camera stopped returning frames
+                if retry >= 300:
+                    break
 
-            elif retry >= 300:
-                break
+                continue
 
             retry = 0
+            self.processing_fps.tick()
+            frame_start = time.perf_counter()
+            quality = self.governor.level
+
+            if self.recorder is not None:
+                self.recorder.recordFrame(self.__frame)
+
+            with profiler.stage("preprocess"):
+                self.__frame, rgb_frame = self.__preprocessor.process(self.__frame)
+
+                # MediaPipe returns normalized coordinates, so the landmarks still map onto the full size frame.
+                if quality.inference_scale < 1:
+                    rgb_frame = cv2.resize(
+                        rgb_frame,
+                        None,
+                        fx=quality.inference_scale,
+                        fy=quality.inference_scale,
+                        interpolation=cv2.INTER_AREA,
+                    )
+
+            with profiler.stage("getHands"):
+                hands = self.__hands.getHands(rgb_frame=rgb_frame)
+
+            if self.recorder is not None and hands is not None:
+                self.recorder.recordHands(
+                    [
+                        self.__hands.landmarksToArray(hand_landmarks)
+                        for hand_landmarks in hands.multi_hand_landmarks
+                    ],
+                    hands.multi_handedness,
+                )
 
-            # OpenCV captures the image from the drone in RGB format, which is why it needs to be converted to BGR to ensure the image is displayed correctly.
-            if self.config["camera"] == "drone":
-                self.__frame = cv2.cvtColor(self.__frame, cv2.COLOR_RGB2BGR)
-
-            self.__frame = cv2.flip(self.__frame, 1)
-            rgb_frame = cv2.cvtColor(self.__frame, cv2.COLOR_BGR2RGB)
-
-            hands = self.__hands.getHands(rgb_frame=rgb_frame)
             if hands is not None:
                 # Processing is performed for each hand identified by MediaPipe.
                 for i, hand_handedness in enumerate(hands.multi_handedness):
@@ -202,149 +604,218 @@ class CameraController:
                     if (
                         label == "Right"
                     ):  # Processing is performed only with the right hand.
-                        if self.show_landmarks:
-                            self.__hands.drawOnFrame(
-                                frame=self.__frame, hand_landmarks=hand_landmarks
+                        if (
+                            not self.headless
+                            and self.show_landmarks
+                            and quality.show_landmarks
+                        ):
+                            self.overlay.skeleton(
+                                self.__hands.landmarksToArray(hand_landmarks)
                             )
 
-                        hand = self.__hands.getHand(
-                            hand_landmarks=hand_landmarks, frame_shape=self.shape
-                        )
+                        self.hands_detected += 1
+                        profiler.count("hands_detected")
+
+                        with profiler.stage("getHand"):
+                            hand = self.__hands.getHand(
+                                hand_landmarks=hand_landmarks, frame_shape=self.shape
+                            )
 
-                        self.__functionControl(hand=hand)
+                        with profiler.stage("functionControl"):
+                            self.__functionControl(hand=hand)
 
                         break  # The loop is exited to avoid any issues with drone control, ensuring that only one hand can control the drone at a time.
 
-            if self.show_minimap:
-                self.__frame = self.minimap.display(
-                    frame=self.__frame,
-                    position=(self.__frame.shape[1] - 50 * 2 - 20, 20),
-                    size=50,
-                )
+                else:
+                    self.__updateGesture(None)
 
-            if not self.showFrame():
-                cv2.destroyAllWindows()
-                break
+            else:
+                self.__updateGesture(None)
 
-    def __functionControl(self, hand: Hand):
-        """It performs all the necessary checks to identify a hand gesture or any global command or action within the instance."""
-        if (
-            hand.WRIST["coord"][1] > hand.INDEX_FINGER_DIP["coord"][1]
-            and hand.WRIST["coord"][1] > hand.MIDDLE_FINGER_DIP["coord"][1]
-            and hand.WRIST["coord"][1] > hand.RING_FINGER_DIP["coord"][1]
-            and hand.WRIST["coord"][1] > hand.PINKY_DIP["coord"][1]
-        ):
-            if (
-                hand.INDEX_FINGER_MCP["coord"][1] < hand.INDEX_FINGER_DIP["coord"][1]
-                and hand.MIDDLE_FINGER_MCP["coord"][1]
-                < hand.MIDDLE_FINGER_DIP["coord"][1]
-                and hand.RING_FINGER_MCP["coord"][1] < hand.RING_FINGER_DIP["coord"][1]
-                and hand.PINKY_MCP["coord"][1] < hand.PINKY_DIP["coord"][1]
-            ):
+            if self.__executor is not None and self.__executor.current is not None:
                 self.displayInformation(
-                    "Start",
-                    (50, 50),
+                    f"Drone: {self.__executor.current} ({self.__executor.pending} queued)",
+                    (10, self.__frame.shape[0] - 30),
+                    cache=False,
                 )
 
-                self.__start = True
-                self.__command = ["start"]
+                if self.compiled_path is not None:
+                    self.displayInformation(
+                        f"Path: {len(self.compiled_path.commands)} commands, ~{self.compiled_path.estimated_time:.1f} s instead of {self.compiled_path.literal_time:.1f} s",
+                        (10, self.__frame.shape[0] - 90),
+                        cache=False,
+                    )
 
-            elif (
-                hand.THUMB_TIP["coord"][1] - 50 > hand.INDEX_FINGER_MCP["coord"][1]
-                and hand.INDEX_FINGER_MCP["coord"][1]
-                > hand.INDEX_FINGER_DIP["coord"][1]
-                and hand.MIDDLE_FINGER_MCP["coord"][1]
-                > hand.MIDDLE_FINGER_DIP["coord"][1]
-                and hand.RING_FINGER_MCP["coord"][1] > hand.RING_FINGER_DIP["coord"][1]
-                and hand.PINKY_MCP["coord"][1] > hand.PINKY_DIP["coord"][1]
-            ):
+            if self.rc_streamer is not None and any(self.rc_streamer.current):
                 self.displayInformation(
-                    "Stop",
-                    (50, 50),
+                    "RC: {} {} {} {}".format(*self.rc_streamer.current),
+                    (10, self.__frame.shape[0] - 110),
+                    cache=False,
                 )
 
-                self.__start = False
-                self.__command = ["stop"]
-
-            elif (
-                hand.INDEX_FINGER_MCP["coord"][1] > hand.INDEX_FINGER_DIP["coord"][1]
-                and hand.MIDDLE_FINGER_MCP["coord"][1]
-                > hand.MIDDLE_FINGER_DIP["coord"][1]
-                and hand.RING_FINGER_MCP["coord"][1] > hand.RING_FINGER_DIP["coord"][1]
-                and hand.PINKY_MCP["coord"][1] > hand.PINKY_DIP["coord"][1]
-            ):
+            if self.__drone_controller is not None:
+                telemetry = self.__drone_controller.get_telemetry()
                 self.displayInformation(
-                    "Wait...",
-                    (50, 50),
+                    (
+                        f"Battery: {telemetry.battery}%  Height: {telemetry.height} cm"
+                        if telemetry
+                        else "No telemetry"
+                    ),
+                    (10, self.__frame.shape[0] - 50),
+                    cache=False,
                 )
 
-                self.__command = ["wait"]
-
-            elif (
-                hand.INDEX_FINGER_MCP["coord"][1] > hand.INDEX_FINGER_DIP["coord"][1]
-                and hand.MIDDLE_FINGER_MCP["coord"][1]
-                < hand.MIDDLE_FINGER_DIP["coord"][1]
-                and hand.RING_FINGER_MCP["coord"][1] < hand.RING_FINGER_DIP["coord"][1]
-                and hand.PINKY_MCP["coord"][1] < hand.PINKY_DIP["coord"][1]
-            ):
+            if isinstance(self.__drone_controller, Swarm):
+                targets = self.__drone_controller.targets
                 self.displayInformation(
-                    "Move",
-                    (50, 50),
+                    f"Drones: {', '.join(targets) if targets else 'all'}",
+                    (10, self.__frame.shape[0] - 70),
                 )
 
-                index_tip_x = hand.INDEX_FINGER_TIP["coord"][0]
-                if self.__command and self.__command[0] == "move":
-                    distance = index_tip_x - self.__command[1]
+            self.displayInformation(
+                f"Capture: {self.capture_fps:.1f} fps  Processing: {self.processing_fps.fps:.1f} fps  Quality: {self.governor.level_index}",
+                (10, self.__frame.shape[0] - 10),
+                cache=False,
+            )
 
-                    if self.__path and self.__path[-1][0] == "move":
-                        self.__path[-1][1] += distance
-                        self.displayInformation(
-                            f"{self.__path[-1][1]}",
-                            (110, 50),
-                        )
+            self.__displayProfiling()
 
-                    else:
-                        self.__path.append(["move", distance])
+            if not self.headless and self.show_minimap and quality.show_minimap:
+                with profiler.stage("minimap"):
+                    self.__frame = self.minimap.display(
+                        frame=self.__frame,
+                        position=(self.__frame.shape[1] - 50 * 2 - 20, 20),
+                        size=50,
+                    )
 
-                    self.minimap.addToPath(action=["move", distance])
+            if not self.headless:
+                with profiler.stage("overlay"):
+                    self.overlay.compose(self.__frame)
 
-                self.__command = ["move", index_tip_x]
+            with profiler.stage("display"):
+                run = self.showFrame() if not self.headless else self.__run
 
-            elif (
-                hand.INDEX_FINGER_MCP["coord"][1] > hand.INDEX_FINGER_DIP["coord"][1]
-                and hand.MIDDLE_FINGER_MCP["coord"][1]
-                > hand.MIDDLE_FINGER_DIP["coord"][1]
-                and hand.RING_FINGER_MCP["coord"][1] < hand.RING_FINGER_DIP["coord"][1]
-                and hand.PINKY_MCP["coord"][1] < hand.PINKY_DIP["coord"][1]
-            ):
-                self.displayInformation(
-                    "Rotate",
-                    (50, 50),
+            latency = time.perf_counter() - frame_start
+            if profiler.enabled:
+                profiler.record("frame", latency)
+
+            self.governor.update(latency)
+            self.__latencies.append(latency)
+            self.frames_processed += 1
+            profiler.count("frames")
+
+            if self.frames_processed == 1 and self.startup is not None:
+                self.startup.mark("first_frame")
+                print(json.dumps({"startup_ms": self.startup.report()}), flush=True)
+
+            if self.__frame_grabber is not None:
+                profiler.setCounter(
+                    "frames_dropped", self.__frame_grabber.dropped_frames
                 )
 
-                index_tip_x = hand.INDEX_FINGER_TIP["coord"][0]
-                if self.__command and self.__command[0] == "rotate":
-                    rotate_degrees = index_tip_x - self.__command[1]
+            if self.__display is not None:
+                profiler.setCounter(
+                    "display_frames_dropped", self.__display.dropped_frames
+                )
+
+            if self.__metrics_exporter is not None:
+                self.__metrics_exporter.maybeExport(profiler)
+
+            if not run:
+                if not self.headless and self.__display is None:
+                    cv2.destroyAllWindows()
+
+                break
+
+            now = time.perf_counter()
+            if self.stats_interval and now - last_stats >= self.stats_interval:
+                last_stats = now
+                print(json.dumps(self.stats()), flush=True)
+
+            self.governor.throttle()
+
+    def __updateGesture(self, gesture: Gesture | None) -> Gesture | None:
+        """Passes the classification of the frame through the debouncer and reacts when the accepted gesture changes
+
+        :param gesture: The classified gesture, None when there is no right hand or no gesture matched
+        :return: The accepted gesture
+        """
+        stable = self.debouncer.update(gesture)
+        self.profiler.setCounter("gestures_rejected", self.debouncer.rejected)
+
+        if not self.debouncer.changed:
+            return stable
 
-                    if self.__path and self.__path[-1][0] == "rotate":
-                        self.__path[-1][1] += rotate_degrees
-                        self.displayInformation(
-                            f"{self.__path[-1][1]}",
-                            (120, 50),
-                        )
+        if self.recorder is not None and stable is not None:
+            self.recorder.recordEvent("gesture", stable.name)
 
-                    else:
-                        self.__path.append(["rotate", rotate_degrees])
+        if self.rc_streamer is not None and (
+            stable is None or stable.name not in ("move", "rotate")
+        ):
+            self.rc_mapper.reset()
+            self.rc_streamer.hover()
 
-                    self.minimap.addToPath(action=["rotate", rotate_degrees])
+        # The finger has to be tracked again from where the next gesture starts
+        if stable is None:
+            self.__command = []
 
-                self.__command = ["rotate", index_tip_x]
+        return stable
+
+    def __functionControl(self, hand: Hand):
+        """It performs all the necessary checks to identify a hand gesture or any global command or action within the instance."""
+        shown = self.gestures.classify(hand)
+        gesture = self.__updateGesture(shown)
+
+        if gesture is not None:
+            self.displayInformation(
+                gesture.label,
+                (50, 50),
+            )
+
+            if gesture.name == "start":
+                if self.debouncer.changed:
+                    self.__start = True
+                self.__command = ["start"]
+
+            elif gesture.name == "stop":
+                if self.debouncer.changed:
+                    self.__start = False
+                self.__command = ["stop"]
+
+            elif gesture.name in ("move", "rotate") and shown != gesture:
+                # The hysteresis keeps the gesture, but the finger belongs to another pose on this frame.
+                # It is not followed, and the next frame of the gesture starts measuring again.
+                self.__command = []
+
+            elif gesture.name in ("move", "rotate") and self.rc_streamer is not None:
+                # Only while flying, the sticks do nothing on the ground
+                if self.__started:
+                    self.rc_streamer.setTarget(
+                        *self.rc_mapper.update(
+                            gesture.name,
+                            hand.landmarks[HandLandmark.INDEX_FINGER_TIP, :2],
+                            self.shape,
+                        ),
+                        **self.__targets(),
+                    )
+                self.__command = [gesture.name]
+
+            elif gesture.name in ("move", "rotate"):
+                self.__addToPath(action=gesture.name, hand=hand)
+
+            else:
+                self.__command = [gesture.name]
 
         if self.__start and not self.__started:
             self.commandToDrone(command="start")
             self.__started = True
 
-        elif self.__started and self.commandToDrone(command="fly?") is False:
+        # While the takeoff or the path is still being executed, the height does not say whether the drone is flying yet.
+        elif (
+            self.__started
+            and not self.commandToDrone(command="busy?")
+            and self.commandToDrone(command="fly?") is False
+        ):
             self.__started = False
 
         elif (
@@ -0,0 +1,168 @@
+import itertools
+import queue
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DroneCommand:
+    """A call to one of the **Controller** methods that is waiting for, or has gone through, execution"""
+
+    id: int
+    name: str  # Name of the Controller method. Example: "move", "rotate", "run", "stop"
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    priority: int = 10  # Lower values are executed first
+    status: str = "queued"  # queued, running, done, failed or cancelled
+    error: Exception | None = field(default=None, repr=False)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def __str__(self) -> str:
+        return " ".join([self.name, *map(str, self.args)])
+
+
+class CommandExecutor:
+    PRIORITY_EMERGENCY = 0
+    PRIORITY_NORMAL = 10
+
+    def __init__(self, drone_controller):
+        """Executes the blocking drone commands one after another on a dedicated thread, so the caller only has to queue them and check their status.
+
+        :param drone_controller: Instance of the **Controller** class, the commands are names of its methods
+        """
+        self.__drone_controller = drone_controller
+        self.__queue = queue.PriorityQueue()
+        self.__counter = itertools.count()
+        self.__lock = threading.Lock()
+        self.__pending = []
+        self.__thread = None
+        self.__run = False
+
+        self.current = None
+        self.last = None
+
+    @property
+    def busy(self) -> bool:
+        """:return: True while a command is being executed or waits in the queue"""
+        with self.__lock:
+            return self.current is not None or bool(self.__pending)
+
+    @property
+    def pending(self) -> int:
+        """:return: How many commands wait in the queue"""
+        with self.__lock:
+            return len(self.__pending)
+
+    def start(self):
+        """Starts the worker thread"""
+        if self.__run:
+            return
+
+        self.__run = True
+        self.__thread = threading.Thread(
+            target=self.__worker, name="CommandExecutor", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self, timeout: float | None = 1.0):
+        """Cancels the queued commands and stops the worker thread. A command that is already sent to the drone still finishes."""
+        self.__run = False
+        self.cancelPending()
+        self.__queue.put((-1, -1, None))
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def submit(
+        self, name: str, *args, priority: int = PRIORITY_NORMAL, **kwargs
+    ) -> DroneCommand:
+        """Queues a command.
+
+        :param name: Name of the Controller method. Example: "move", "rotate", "run", "stop"
+        :param args: Parameters for the method
+        :param priority: Commands with a lower value are executed first, **PRIORITY_EMERGENCY** also cancels everything that is still queued
+        :param kwargs: Keyword parameters for the method. Example: the **targets** of a **Swarm**
+        :return: The queued command, its status is updated by the worker
+        """
+        if priority <= self.PRIORITY_EMERGENCY:
+            self.cancelPending()
+
+        command = DroneCommand(
+            id=next(self.__counter),
+            name=name,
+            args=args,
+            kwargs=kwargs,
+            priority=priority,
+        )
+
+        with self.__lock:
+            self.__pending.append(command)
+
+        self.__queue.put((priority, command.id, command))
+
+        return command
+
+    def cancel(self, command: DroneCommand) -> bool:
+        """Cancels a command that has not started yet.
+
+        :return: True if the command was cancelled
+        """
+        with self.__lock:
+            if command.status != "queued":
+                return False
+
+            command.status = "cancelled"
+            self.__pending.remove(command)
+
+        command.done.set()
+
+        return True
+
+    def cancelPending(self) -> int:
+        """Cancels every command that has not started yet.
+
+        :return: How many commands were cancelled
+        """
+        with self.__lock:
+            pending, self.__pending = self.__pending, []
+
+            for command in pending:
+                command.status = "cancelled"
+
+        for command in pending:
+            command.done.set()
+
+        return len(pending)
+
+    def __worker(self):
+        while self.__run:
+            command = self.__queue.get()[2]
+
+            if command is None:
+                continue
+
+            with self.__lock:
+                if command.status != "queued":
+                    continue
+
+                self.__pending.remove(command)
+                command.status = "running"
+                self.current = command
+
+            try:
+                getattr(self.__drone_controller, command.name)(
+                    *command.args, **command.kwargs
+                )
+                command.status = "done"
+
+            except Exception as err:
+                command.status = "failed"
+                command.error = err
+                print(f"ERROR: drone command '{command}' failed: {err}")
+
+            with self.__lock:
+                self.current = None
+                self.last = command
+
+            command.done.set()
@@ -4,68 +4,137 @@ from utils import MathDrawing
 
 
 class Minimap:
-    __minimap = np.zeros((5000, 5000, 3), dtype=np.uint8)
-    __minimap_path = []
-    __minimap_path_index = 0
-    __drone_rotate_degrees = 0
-    __drone_position = [__minimap.shape[1] // 2, __minimap.shape[0] // 2]
+    TILE_SIZE = 256  # Size in minimap pixels of a cell of the spatial index
+    LINE_THICKNESS = 10  # Thickness of the path in minimap pixels
+    DRONE_SIZE = 20  # Size of the drone marker in minimap pixels
 
     def __init__(self):
+        """Minimap with the movements coordinated for the drone.
+
+        The path is kept as vector segments; the segments are indexed by the tiles of a sparse grid that are allocated only when a segment crosses them. Only the segments visible around the drone are drawn, directly at the size of the overlay.
+        """
         self.__brush = MathDrawing()
+        self.__minimap_path = []
+        self.__minimap_path_index = 0
+        self.__drone_rotate_degrees = 0
+        self.__drone_position = (0, 0)
+        self.__segments = []  # ((x0, y0), (x1, y1)) in minimap pixels
+        self.__tiles = {}  # (tile x, tile y) -> indexes of the segments crossing the tile
 
     def addToPath(self, action: list[str | int]):
         self.__minimap_path.append(action)
 
     def clearPath(self):
+        """Removes the queued actions, the path that is already drawn stays on the minimap"""
         self.__minimap_path_index = 0
         self.__minimap_path = []
 
-    def display(
-        self,
-        frame: np.ndarray,
-        position: list[int] | tuple[int],
-        size: list[int] | tuple[int],
-    ):
-        for i, action in enumerate(self.__minimap_path[self.__minimap_path_index :]):
-            if i < self.__minimap_path_index:
-                continue
+    def __tileRange(self, x0: float, y0: float, x1: float, y1: float):
+        """:return: The tiles covered by the rectangle between the two points"""
+        ts = self.TILE_SIZE
+        tx0, tx1 = int(min(x0, x1) // ts), int(max(x0, x1) // ts)
+        ty0, ty1 = int(min(y0, y1) // ts), int(max(y0, y1) // ts)
+
+        return (
+            (tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1)
+        )
+
+    def __addSegment(self, start: tuple[int], end: tuple[int]):
+        index = len(self.__segments)
+        self.__segments.append((start, end))
 
-            self.__minimap_path_index = i + 1
+        margin = self.LINE_THICKNESS
+        for tile in self.__tileRange(
+            start[0] - margin, start[1] - margin, end[0] + margin, end[1] + margin
+        ):
+            self.__tiles.setdefault(tile, []).append(index)
 
+    def __updatePath(self):
+        """Applies the actions added since the last update"""
+        for action in self.__minimap_path[self.__minimap_path_index :]:
             if action[0] == "rotate":
                 self.__drone_rotate_degrees += action[1]
 
             elif action[0] == "move":
-                line = self.__brush.calculateLineByAngle(
+                position = self.__brush.pointByAngle(
                     self.__drone_position[0],
                     self.__drone_position[1],
                     action[1],
                     self.__drone_rotate_degrees,
                 )
-                self.__drone_position = line[-1]
-                self.__brush.drawLine(self.__minimap, line, (0, 255, 0))
 
-        minimap = self.__minimap.copy()
+                if position != self.__drone_position:
+                    self.__addSegment(self.__drone_position, position)
+                    self.__drone_position = position
+
+        self.__minimap_path_index = len(self.__minimap_path)
+
+    def render(
+        self, view_size: list[int] | tuple[int], output_size: list[int] | tuple[int]
+    ) -> np.ndarray:
+        """Draws the part of the minimap around the drone.
+
+        :param view_size: Width and height in minimap pixels of the area around the drone
+        :param output_size: Width and height in pixels of the returned image
+        :return: A BGR image with the visible path and the drone
+        """
+        self.__updatePath()
+
+        scale = np.array(
+            (output_size[0] / view_size[0], output_size[1] / view_size[1])
+        )
+        origin = np.array(
+            (
+                self.__drone_position[0] - view_size[0] // 2,
+                self.__drone_position[1] - view_size[1] // 2,
+            )
+        )
+        view = np.zeros((output_size[1], output_size[0], 3), dtype=np.uint8)
+
+        visible = set()
+        for tile in self.__tileRange(
+            origin[0], origin[1], origin[0] + view_size[0], origin[1] + view_size[1]
+        ):
+            visible.update(self.__tiles.get(tile, ()))
+
+        if visible:
+            lines = np.array([self.__segments[i] for i in sorted(visible)])
+            lines = ((lines - origin) * scale).round().astype(np.int32)
+            cv2.polylines(
+                view,
+                lines,
+                False,
+                (0, 255, 0),
+                max(1, round(self.LINE_THICKNESS * scale.min())),
+            )
+
+        center = ((np.array(self.__drone_position) - origin) * scale).round()
+        half = np.maximum(1, np.round(self.DRONE_SIZE * scale / 2))
         cv2.rectangle(
-            minimap,
-            self.__drone_position,
-            (self.__drone_position[0] + 1, self.__drone_position[1] + 1),
+            view,
+            tuple((center - half).astype(int)),
+            tuple((center + half).astype(int)),
             (0, 0, 255),
-            20,
+            -1,
         )
+
+        return view
+
+    def display(
+        self,
+        frame: np.ndarray,
+        position: list[int] | tuple[int],
+        size: list[int] | tuple[int],
+    ):
         frame_size = frame.shape
 
-        half_frame_size = (frame_size[1] // 2, frame_size[0] // 2)
+        # The area around the drone as large as the frame is shrunk to the size of the overlay
+        minimap = self.render(
+            view_size=(frame_size[1], frame_size[0]), output_size=(size * 2, size * 2)
+        )
         frame = self.__brush.drawMinimapOnFrame(
             frame,
-            minimap[
-                self.__drone_position[1]
-                - half_frame_size[1] : self.__drone_position[1]
-                + half_frame_size[1],
-                self.__drone_position[0]
-                - half_frame_size[0] : self.__drone_position[0]
-                + half_frame_size[0],
-            ],
+            minimap,
             (position[0], position[1]),
             size=size,
         )
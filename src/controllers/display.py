@@ -0,0 +1,130 @@
+import platform
+import queue
+import threading
+import cv2
+import numpy as np
+
+
+class FrameDisplay:
+    def __init__(self, window_name: str = "Video Capture", refresh_interval: float = 0.005):
+        """Shows the frames in an OpenCV window from its own thread, so that imshow and waitKey do not slow down the processing loop.
+
+        **show** copies the frame (the loop reuses its buffers) and returns at once. The window always shows the newest frame; the frames that arrive while the previous one is still being shown are dropped.
+        The keys pressed in the window are sent back through a queue and read with **keys**.
+        Every OpenCV call of the window happens on the display thread. This works with the GTK, Qt and Win32 backends of HighGUI, but not on macOS, where Cocoa only accepts window calls from the main thread (see **supported**).
+
+        :param window_name: Title of the window
+        :param refresh_interval: Seconds the thread waits for a new frame before it polls the keyboard again
+        """
+        self.window_name = window_name
+        self.refresh_interval = refresh_interval
+
+        self.frames_shown = 0
+        self.dropped_frames = 0
+
+        self.__pending = None  # Buffer with the newest frame, not shown yet
+        self.__shown = None  # Buffer the display thread is showing
+        self.__new_frame = False
+        self.__condition = threading.Condition()
+        self.__keys = queue.SimpleQueue()
+        self.__thread = None
+        self.__run = False
+
+    @staticmethod
+    def supported() -> bool:
+        """:return: False on macOS, where imshow crashes when it is not called from the main thread"""
+        return platform.system() != "Darwin"
+
+    @property
+    def running(self) -> bool:
+        return self.__run
+
+    def start(self):
+        """Starts the display thread"""
+        if self.__run:
+            return
+
+        self.__run = True
+        self.__thread = threading.Thread(
+            target=self.__displayLoop, name="FrameDisplay", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self, timeout: float | None = 1.0):
+        """Stops the display thread and closes the window"""
+        self.__run = False
+
+        with self.__condition:
+            self.__condition.notify_all()
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def show(self, frame: np.ndarray):
+        """Queues a frame for the window, replacing the one that was not shown yet
+
+        :param frame: The BGR frame, it is copied so the caller can reuse it right away
+        """
+        with self.__condition:
+            if self.__pending is None or self.__pending.shape != frame.shape:
+                self.__pending = np.empty_like(frame)
+
+            np.copyto(self.__pending, frame)
+
+            if self.__new_frame:
+                self.dropped_frames += 1
+
+            self.__new_frame = True
+            self.__condition.notify()
+
+    def keys(self) -> list[int]:
+        """:return: The keys pressed in the window since the last call, in order"""
+        keys = []
+
+        while True:
+            try:
+                keys.append(self.__keys.get_nowait())
+
+            except queue.Empty:
+                return keys
+
+    def __displayLoop(self):
+        try:
+            while self.__run:
+                with self.__condition:
+                    if not self.__new_frame:
+                        self.__condition.wait(self.refresh_interval)
+
+                    if self.__new_frame:
+                        # The buffers are swapped, the next frame is copied while this one is shown
+                        self.__pending, self.__shown = self.__shown, self.__pending
+                        self.__new_frame = False
+                        frame = self.__shown
+
+                    else:
+                        frame = None
+
+                if frame is not None:
+                    cv2.imshow(self.window_name, frame)
+                    self.frames_shown += 1
+
+                # The window only handles its events inside waitKey, it is called even without a new frame
+                if self.frames_shown:
+                    key = cv2.waitKey(1) & 0xFF
+
+                    if key != 0xFF:
+                        self.__keys.put(key)
+
+        finally:
+            if self.frames_shown:
+                cv2.destroyWindow(self.window_name)
+                cv2.waitKey(1)
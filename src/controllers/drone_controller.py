@@ -1,24 +1,111 @@
-from djitellopy import Tello
-import keyboard
+from dataclasses import dataclass
+import threading
+import time
 import numpy as np
 
 
+@dataclass(frozen=True)
+class Telemetry:
+    """Snapshot of the state packet last received from the drone"""
+
+    timestamp: float  # time.monotonic() when the packet was received
+    height: int  # cm
+    battery: int  # 0-100
+    pitch: int  # degrees
+    roll: int  # degrees
+    yaw: int  # degrees
+    flying: bool
+
+    @property
+    def age(self) -> float:
+        """:return: How many seconds ago the packet was received"""
+        return time.monotonic() - self.timestamp
+
+
 class Controller:
     capture = None
+    telemetry = None  # The last Telemetry received from the drone
+
+    def __init__(
+        self,
+        telemetry_max_age: float = 1.0,
+        host: str = "192.168.10.1",  # Tello.TELLO_IP
+        control_port: int = 8889,  # Tello.CONTROL_UDP_PORT
+    ):
+        """Interface for controlling the drone via the djitellopy module
+
+        :param telemetry_max_age: After how many seconds without a new state packet the cached telemetry is considered stale
+        :param host: IP of the drone
+        :param control_port: Port the drone listens on for commands. It only has to be changed for the local simulator (src.simulator), because djitellopy already uses 8889 on this machine.
+        """
+        # djitellopy is only imported when a drone is connected, the app starts faster without one
+        from djitellopy import Tello
 
-    def __init__(self):
-        """Interface for controlling the drone via the djitellopy module"""
-        self.drone = Tello()
+        self.drone = Tello(host=host)
+        self.drone.address = (host, control_port)
         self.drone.connect()
 
-    def get_battery(self) -> int:
-        """:return: The percentage of how charged the battery is currently between 0-100"""
-        return self.drone.get_battery()
+        self.telemetry_max_age = telemetry_max_age
+        self.__telemetry_run = True
+        self.__telemetry_thread = threading.Thread(
+            target=self.__telemetry_loop, name="Telemetry", daemon=True
+        )
+        self.__telemetry_thread.start()
+
+    def __telemetry_loop(self):
+        """Follows the state stream received by djitellopy in the background and keeps the last packet as a **Telemetry** snapshot"""
+        last_state = None
+
+        while self.__telemetry_run:
+            state = self.drone.get_current_state()
+
+            # djitellopy replaces the state dict with every packet it parses
+            if state and state is not last_state:
+                last_state = state
+                self.telemetry = Telemetry(
+                    timestamp=time.monotonic(),
+                    height=state.get("h", 0),
+                    battery=state.get("bat", 0),
+                    pitch=state.get("pitch", 0),
+                    roll=state.get("roll", 0),
+                    yaw=state.get("yaw", 0),
+                    flying=state.get("h", 0) > 0,
+                )
+
+            time.sleep(0.02)
+
+    def get_telemetry(self, max_age: float | None = None) -> Telemetry | None:
+        """:param max_age: Maximum age of the state packet in seconds, by default **telemetry_max_age**
+        :return: The cached telemetry or None if it is missing or stale
+        """
+        telemetry = self.telemetry
+        max_age = self.telemetry_max_age if max_age is None else max_age
+
+        if telemetry is None or telemetry.age > max_age:
+            return None
 
-    def run_camera(self):
-        """Starts streaming from the drone's front camera and saves the video stream from the camera to **self.capture**"""
+        return telemetry
+
+    def close(self):
+        """Stops following the state stream"""
+        self.__telemetry_run = False
+        self.__telemetry_thread.join(1.0)
+
+    def get_battery(self) -> int | None:
+        """:return: The percentage of how charged the battery is currently between 0-100, None if the telemetry is stale"""
+        telemetry = self.get_telemetry()
+
+        return telemetry.battery if telemetry else None
+
+    def run_camera(self, frame_read: bool = True):
+        """Starts streaming from the drone's front camera and saves the video stream from the camera to **self.capture**
+
+        :param frame_read: If False, the stream is only turned on and decoded elsewhere, for example by **FFmpegFrameSource**
+        """
         self.drone.streamon()
-        self.capture = self.drone.get_frame_read()
+
+        if frame_read:
+            self.capture = self.drone.get_frame_read()
 
     def get_capture(self) -> np.ndarray | None:
         """Too frame with image from video stream (**self.capture**)"""
@@ -27,9 +114,11 @@ class Controller:
 
         return None
 
-    def get_height(self):
-        """:return: Current height in cm"""
-        return self.drone.get_height()
+    def get_height(self) -> int | None:
+        """:return: Current height in cm, None if the telemetry is stale"""
+        telemetry = self.get_telemetry()
+
+        return telemetry.height if telemetry else None
 
     def run(self):
         """Running drone"""
@@ -106,7 +195,36 @@ class Controller:
             case "right":
                 self.drone.send_rc_control(0, 0, 0, -d)
 
+    def send_rc(self, left_right: int, forward_back: int, up_down: int, yaw: int):
+        """Sets the virtual sticks of the remote control, the drone keeps the speeds until the next values. It does not wait for an answer.
+
+        :param left_right: between -100 and 100, positive to the right
+        :param forward_back: between -100 and 100, positive forward
+        :param up_down: between -100 and 100, positive up
+        :param yaw: between -100 and 100, positive clockwise
+        """
+        self.drone.send_rc_control(left_right, forward_back, up_down, yaw)
+
+    def go(self, x: int, y: int, z: int, speed: int):
+        """Flies in a straight line to a point relative to the drone, without turning
+
+        :param x: cm forward, between -500 and 500
+        :param y: cm to the left, between -500 and 500
+        :param z: cm up, between -500 and 500
+        :param speed: cm/s, between 10 and 100
+        """
+        self.drone.go_xyz_speed(x, y, z, speed)
+
+    def curve(self, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int, speed: int):
+        """Flies along the arc through the first point to the second one, both relative to the drone like in **go**
+
+        :param speed: cm/s, between 10 and 60
+        """
+        self.drone.curve_xyz_speed(x1, y1, z1, x2, y2, z2, speed)
+
     def __keyboard_press(self, last_pressed: str, key: str) -> str:
+        import keyboard
+
         press = ""
 
         if keyboard.is_pressed(key):
@@ -128,6 +246,8 @@ class Controller:
         :q: Rotate left 10 degrees
         :e: Rotate right 10 degrees
         """
+        import keyboard
+
         run = True
 
         while run:
@@ -0,0 +1,306 @@
+import re
+import shutil
+import subprocess
+import threading
+import time
+import numpy as np
+
+
+class FFmpegFrameSource:
+    CHANNELS = {"bgr24": 3, "rgb24": 3, "gray": 1}
+
+    def __init__(
+        self,
+        url: str,
+        resolution: list[int] | tuple[int] | None = None,
+        pixel_format: str = "bgr24",
+        ffmpeg: str | None = None,
+        ring_size: int = 3,
+        timeout: float = 0.1,
+        restart: bool = True,
+        restart_delay: float = 1.0,
+        realtime: bool = False,
+        input_options: list[str] | None = None,
+    ):
+        """Frame source for **CameraController** that decodes a video stream with an ffmpeg process and reads the raw frames from its pipe.
+
+        The frames are read on a background thread with **readinto** straight into a ring of preallocated arrays, so no memory is allocated per frame.
+        Only the newest frame is returned, the older ones that were not read in time are dropped. A returned frame stays valid until the next call. For that reason it should not be combined with the threaded capture of **CameraController**.
+
+        Example: ``CameraController(get_frame_function=FFmpegFrameSource("udp://0.0.0.0:11111"))``
+
+        :param url: Anything ffmpeg can read: the Tello stream (udp://0.0.0.0:11111), a video file, a camera device
+        :param resolution: Width and height of the frames, by default they are read from the output of ffmpeg. If it is given, ffmpeg scales the frames to it.
+        :param pixel_format: bgr24 for OpenCV, rgb24 or gray
+        :param ffmpeg: Path to the ffmpeg executable, by default the one found on the PATH
+        :param ring_size: How many frame buffers are allocated, at least 3
+        :param timeout: How many seconds a call waits for a new frame before returning None
+        :param restart: If True, ffmpeg is started again when it fails or the stream ends, otherwise the source stops
+        :param restart_delay: Seconds to wait before ffmpeg is started again
+        :param realtime: If True, a file is read at its own frame rate instead of as fast as possible
+        :param input_options: ffmpeg options placed before the input, by default low latency options for network streams
+        """
+        if pixel_format not in self.CHANNELS:
+            raise ValueError(f"Unsupported pixel format: {pixel_format}")
+
+        self.url = url
+        self.resolution = tuple(resolution) if resolution else None
+        self.pixel_format = pixel_format
+        self.ffmpeg = ffmpeg or shutil.which("ffmpeg") or "ffmpeg"
+        self.ring_size = max(ring_size, 3)
+        self.timeout = timeout
+        self.restart = restart
+        self.restart_delay = restart_delay
+        self.realtime = realtime
+
+        if input_options is None:
+            input_options = (
+                [
+                    "-fflags",
+                    "nobuffer",
+                    "-flags",
+                    "low_delay",
+                    "-probesize",
+                    "32",
+                    "-analyzeduration",
+                    "0",
+                ]
+                if "://" in url
+                else []
+            )
+        self.input_options = input_options
+
+        self.frames_read = 0
+        self.dropped_frames = 0
+        self.restarts = 0
+        self.__process = None
+        self.__thread = None
+        self.__running = False
+        self.__ended = False
+        self.__ring = []
+        self.__views = []
+        self.__detected = None  # Size of the frames found in the log of ffmpeg
+        self.__latest = None  # Index in the ring of the newest complete frame
+        self.__latest_id = 0
+        self.__returned_id = 0
+        self.__in_use = None  # Index in the ring of the frame returned by the last call
+        self.__condition = threading.Condition()
+        self.__resolution_found = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    def command(self) -> list[str]:
+        """:return: The command line of the ffmpeg process"""
+        command = [self.ffmpeg, "-hide_banner", "-nostats", "-loglevel", "info"]
+
+        if self.realtime:
+            command.append("-re")
+
+        command += [*self.input_options, "-i", self.url, "-an"]
+
+        if self.resolution:
+            command += ["-vf", f"scale={self.resolution[0]}:{self.resolution[1]}"]
+
+        return command + ["-f", "rawvideo", "-pix_fmt", self.pixel_format, "-"]
+
+    def start(self):
+        """Starts ffmpeg and the reader thread. ffmpeg is started here the first time, so an OSError (ffmpeg not found) is raised to the caller."""
+        if self.__running:
+            return
+
+        self.__spawn()
+        self.__running = True
+        self.__ended = False
+        self.__thread = threading.Thread(
+            target=self.__readLoop, name="FFmpegFrameSource", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self.__running = False
+        self.__terminate()
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def __call__(self) -> np.ndarray | None:
+        """:return: The newest frame that was not returned yet, None if no new frame arrived in time or the stream ended"""
+        if not self.__running and not self.__ended:
+            self.start()
+
+        with self.__condition:
+            if self.__latest_id == self.__returned_id:
+                self.__condition.wait_for(
+                    lambda: self.__latest_id != self.__returned_id
+                    or not self.__running,
+                    self.timeout,
+                )
+
+            if self.__latest_id == self.__returned_id:
+                return None
+
+            self.dropped_frames += self.__latest_id - self.__returned_id - 1
+            self.__returned_id = self.__latest_id
+            self.__in_use = self.__latest
+
+            return self.__ring[self.__latest]
+
+    def __spawn(self):
+        self.__resolution_found.clear()
+        self.__process = subprocess.Popen(
+            self.command(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+        )
+        threading.Thread(
+            target=self.__readLog,
+            args=(self.__process,),
+            name="FFmpegFrameSource-log",
+            daemon=True,
+        ).start()
+
+    def __readLog(self, process: subprocess.Popen):
+        """Drains the log of ffmpeg, so that it never blocks on a full pipe, and finds the size of the output frames in it"""
+        output = False
+
+        for line in iter(process.stderr.readline, b""):
+            line = line.decode("utf-8", "replace")
+
+            if line.startswith("Output #0"):
+                output = True
+
+            elif output and not self.__resolution_found.is_set():
+                match = re.search(
+                    r"Stream #0:\d+.*Video: .*?(\d{2,5})x(\d{2,5})", line
+                )
+
+                if match:
+                    self.__detected = (int(match.group(1)), int(match.group(2)))
+                    self.__resolution_found.set()
+
+        process.stderr.close()
+
+    def __allocate(self, width: int, height: int):
+        channels = self.CHANNELS[self.pixel_format]
+        shape = (height, width, channels) if channels > 1 else (height, width)
+
+        if self.__ring and self.__ring[0].shape == shape:
+            return
+
+        with self.__condition:
+            self.__ring = [
+                np.empty(shape, dtype=np.uint8) for _ in range(self.ring_size)
+            ]
+            self.__views = [memoryview(frame).cast("B") for frame in self.__ring]
+            self.__latest = None
+            self.__in_use = None
+            self.__returned_id = self.__latest_id
+
+    def __nextSlot(self) -> int:
+        """:return: A buffer that holds neither the newest frame nor the frame being used by the caller"""
+        slot = 0 if self.__latest is None else (self.__latest + 1) % self.ring_size
+
+        while slot == self.__in_use or slot == self.__latest:
+            slot = (slot + 1) % self.ring_size
+
+        return slot
+
+    def __readFrame(self, pipe, view: memoryview) -> bool:
+        """Fills the buffer with exactly one frame, the pipe may return it in several pieces"""
+        filled = 0
+        size = len(view)
+
+        while filled < size:
+            count = pipe.readinto(view[filled:])
+
+            if not count:
+                return False
+
+            filled += count
+
+        return True
+
+    def __readLoop(self):
+        while self.__running:
+            process = self.__process
+
+            # The size of the frames is only known once ffmpeg opened the stream
+            while self.__running and process is not None and process.poll() is None:
+                if self.__resolution_found.wait(0.1):
+                    break
+
+            if process is not None and self.__resolution_found.is_set():
+                self.__allocate(*(self.resolution or self.__detected))
+
+                while self.__running:
+                    with self.__condition:
+                        slot = self.__nextSlot()
+
+                    if not self.__readFrame(process.stdout, self.__views[slot]):
+                        break
+
+                    with self.__condition:
+                        self.__latest = slot
+                        self.__latest_id += 1
+                        self.frames_read += 1
+                        self.__condition.notify_all()
+
+            self.__terminate()
+
+            if not self.__running:
+                break
+
+            if not self.restart:
+                self.__ended = True
+                self.__running = False
+
+                with self.__condition:
+                    self.__condition.notify_all()
+
+                break
+
+            print(f"WARNING: ffmpeg stopped reading {self.url}, it is started again")
+            self.restarts += 1
+            time.sleep(self.restart_delay)
+
+            try:
+                self.__spawn()
+
+            except OSError as err:
+                # The failed start is handled like a stream that ended, it is tried again after the delay
+                print(f"WARNING: ffmpeg could not be started: {err}")
+                self.__process = None
+
+    def __terminate(self):
+        process = self.__process
+
+        if process is None:
+            return
+
+        if process.poll() is None:
+            process.terminate()
+
+            try:
+                process.wait(1.0)
+
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+        process.stdout.close()
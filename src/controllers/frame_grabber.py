@@ -0,0 +1,110 @@
+import threading
+import numpy as np
+from collections import deque
+from typing import Callable
+from utils.timing import FpsCounter
+
+
+class FrameGrabber:
+    def __init__(
+        self,
+        get_frame_function: Callable[[], np.ndarray],
+        buffer_size: int = 1,
+        *args,
+        **kwargs,
+    ):
+        """Reads frames on a background thread so that a slow consumer never delays the capture.
+
+        The frames are kept in a small ring buffer; when it is full the oldest frame is dropped, so the consumer always gets the newest one.
+
+        :param get_frame_function: Custom function that should return the frame with the image taken from the video camera.
+        :param buffer_size: How many frames are kept before the oldest ones start to be dropped
+        :param ...: Any other parameter will be as a parameter for **get_frame_function**
+        """
+        self.__get_frame_function = get_frame_function
+        self.__func_params = [args, kwargs]
+        self.__buffer = deque(maxlen=max(1, buffer_size))
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__run = False
+        self.__frame_id = 0
+
+        self.capture_fps = FpsCounter()
+        self.dropped_frames = 0
+
+    @property
+    def running(self) -> bool:
+        return self.__run
+
+    def start(self):
+        """Starts the capture thread"""
+        if self.__run:
+            return
+
+        self.__run = True
+        self.__thread = threading.Thread(
+            target=self.__captureLoop, name="FrameGrabber", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self, timeout: float | None = 1.0):
+        """Stops the capture thread and wakes up any consumer waiting for a frame"""
+        self.__run = False
+
+        with self.__condition:
+            self.__condition.notify_all()
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __captureLoop(self):
+        last_frame = None
+
+        while self.__run:
+            frame = self.__get_frame_function(
+                *self.__func_params[0], **self.__func_params[1]
+            )
+
+            # Sources such as the drone stream keep returning the same array until a new frame is decoded, that one does not have to be processed again.
+            if frame is None or frame is last_frame:
+                with self.__condition:
+                    self.__condition.wait(0.001)
+
+                continue
+
+            last_frame = frame
+            self.capture_fps.tick()
+
+            with self.__condition:
+                if len(self.__buffer) == self.__buffer.maxlen:
+                    self.dropped_frames += 1
+
+                self.__frame_id += 1
+                self.__buffer.append((self.__frame_id, frame))
+                self.__condition.notify()
+
+    def read(
+        self, timeout: float | None = 0.1, latest: bool = True
+    ) -> tuple[int, np.ndarray] | None:
+        """Takes a frame out of the buffer.
+
+        :param timeout: How many seconds to wait for a new frame
+        :param latest: If True the newest frame is returned and the older ones are discarded, otherwise the frames are returned in the order they were captured
+        :return: A (frame id, frame) pair or None if no new frame arrived in time
+        """
+        with self.__condition:
+            if not self.__buffer and self.__run:
+                self.__condition.wait(timeout)
+
+            if not self.__buffer:
+                return None
+
+            if not latest:
+                return self.__buffer.popleft()
+
+            frame = self.__buffer.pop()
+            self.dropped_frames += len(self.__buffer)
+            self.__buffer.clear()
+
+            return frame
@@ -0,0 +1,99 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    inference_scale: float  # Fraction of the capture resolution given to MediaPipe
+    target_fps: float | None  # Maximum rate of the loop, None for no limit
+    show_landmarks: bool
+    show_minimap: bool
+    show_information: bool
+
+
+class QualityGovernor:
+    # From the best quality to the cheapest one
+    LEVELS = (
+        QualityLevel(1.0, None, True, True, True),
+        QualityLevel(0.75, None, True, True, True),
+        QualityLevel(0.5, None, True, False, True),
+        QualityLevel(0.5, 20, False, False, True),
+        QualityLevel(0.35, 15, False, False, False),
+    )
+
+    def __init__(
+        self,
+        latency_budget_ms: float = 60,
+        enabled: bool = True,
+        window: int = 15,
+        recovery_ratio: float = 0.6,
+    ):
+        """Keeps the latency of a frame under the budget by lowering the quality of the processing when it is exceeded and raising it again when there is enough headroom.
+
+        :param latency_budget_ms: Maximum time in milliseconds the processing of a frame should take
+        :param enabled: If False, the best quality is always used
+        :param window: How many of the latest frames are averaged before the quality is changed
+        :param recovery_ratio: The quality is raised when the average latency falls below this fraction of the budget
+        """
+        self.latency_budget = latency_budget_ms / 1000
+        self.enabled = enabled
+        self.recovery_ratio = recovery_ratio
+        self.__latencies = deque(maxlen=window)
+        self.__index = 0
+        self.__last_frame = None
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.LEVELS[self.__index]
+
+    @property
+    def level_index(self) -> int:
+        """:return: 0 for the best quality, higher values for cheaper ones"""
+        return self.__index
+
+    @property
+    def latency(self) -> float:
+        """:return: The average latency in seconds of the latest frames"""
+        if not self.__latencies:
+            return 0.0
+
+        return sum(self.__latencies) / len(self.__latencies)
+
+    def update(self, latency: float):
+        """Registers the latency of a frame and changes the quality level if needed.
+
+        :param latency: How many seconds the processing of the frame took
+        """
+        if not self.enabled:
+            return
+
+        self.__latencies.append(latency)
+
+        # The level is changed only once the whole window was measured with the current one
+        if len(self.__latencies) < self.__latencies.maxlen:
+            return
+
+        average = self.latency
+
+        if average > self.latency_budget and self.__index < len(self.LEVELS) - 1:
+            self.__index += 1
+            self.__latencies.clear()
+
+        elif average < self.latency_budget * self.recovery_ratio and self.__index > 0:
+            self.__index -= 1
+            self.__latencies.clear()
+
+    def throttle(self):
+        """Waits so that the loop does not run faster than the target fps of the current level"""
+        target_fps = self.level.target_fps if self.enabled else None
+        now = time.perf_counter()
+
+        if target_fps and self.__last_frame is not None:
+            delay = self.__last_frame + 1 / target_fps - now
+
+            if delay > 0:
+                time.sleep(delay)
+                now += delay
+
+        self.__last_frame = now
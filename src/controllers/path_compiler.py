@@ -0,0 +1,297 @@
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class PathCommand:
+    name: str  # Name of the Controller method: go, curve or rotate
+    args: tuple
+
+    def __str__(self) -> str:
+        return f"{self.name} {' '.join(str(arg) for arg in self.args)}"
+
+
+@dataclass
+class CompiledPath:
+    commands: list[PathCommand] = field(default_factory=list)
+    estimated_time: float = 0.0  # Seconds the drone needs to execute the commands
+    literal_time: float = 0.0  # Seconds the path would take executed entry by entry
+
+
+class PathCompiler:
+    MAX_GO = 500  # cm, the limit of each axis of go and curve
+    MIN_GO = 20  # cm, the drone rejects a go where every axis is within this
+    MIN_CURVE_RADIUS = 50  # cm
+    MAX_CURVE_RADIUS = 1000  # cm
+    MAX_CURVE_SPEED = 60  # cm/s
+
+    def __init__(
+        self,
+        speed: int = 50,
+        min_move: float = 20,
+        min_rotate: float = 5,
+        waypoints: bool = False,
+        curves: bool = True,
+        yaw_rate: float = 90,
+        command_overhead: float = 0.5,
+    ):
+        """Turns the path recorded from the gestures (**["move", cm]** and **["rotate", degrees]** entries, positive forward and to the left) into as few SDK commands as possible.
+
+        Consecutive entries of the same kind are merged, opposite ones cancel out, and entries below the thresholds are dropped as noise.
+        The moves are then expressed relative to the position and heading of the drone at the start of the path, so they become **go x y z speed** commands and the rotations in between disappear; a single rotation at the end gives the final heading.
+
+        :param speed: Speed of go and curve in cm/s, between 10 and 100
+        :param min_move: Moves shorter than this many cm are dropped
+        :param min_rotate: Rotations smaller than this many degrees are dropped
+        :param waypoints: If True, the drone passes through the end of every move of the path, otherwise it flies straight to the end of the path
+        :param curves: With waypoints, two waypoints are flown as one curve command when the drone accepts the arc through them
+        :param yaw_rate: Rotation speed of the drone in degrees/s, for the time estimate
+        :param command_overhead: Seconds each command costs besides the flight itself (round trip, acceleration), for the time estimate
+        """
+        self.speed = min(max(int(speed), 10), 100)
+        self.min_move = min_move
+        self.min_rotate = min_rotate
+        self.waypoints = waypoints
+        self.curves = curves
+        self.yaw_rate = yaw_rate
+        self.command_overhead = command_overhead
+
+    def simplify(self, path: list[list]) -> list[list]:
+        """Merges consecutive entries of the same kind and drops the noise, until nothing changes anymore. Dropping a small rotation can make two moves consecutive, which is why it is repeated.
+        The small rotations are dropped first, so that the short moves on both sides of them are merged before their length is checked.
+
+        :return: A new path, the given one is not modified
+        """
+        path = [[action, value] for action, value in path]
+
+        while True:
+            merged = []
+            for action, value in path:
+                if merged and merged[-1][0] == action:
+                    merged[-1][1] += value
+                else:
+                    merged.append([action, value])
+
+            for entry in merged:
+                if entry[0] == "rotate":
+                    entry[1] = self.__wrapAngle(entry[1])
+
+            simplified = [
+                [action, value]
+                for action, value in merged
+                if action == "move" or abs(value) >= self.min_rotate
+            ]
+
+            if simplified == merged:
+                simplified = [
+                    [action, value]
+                    for action, value in merged
+                    if action == "rotate" or abs(value) >= self.min_move
+                ]
+
+            if simplified == path:
+                return simplified
+
+            path = simplified
+
+    def compile(self, path: list[list]) -> CompiledPath:
+        """:param path: The entries recorded by **CameraController**
+        :return: The commands to send and the estimated time, with and without compiling
+        """
+        simplified = self.simplify(path)
+        x = y = heading = 0.0
+        points = []
+
+        for action, value in simplified:
+            if action == "move":
+                x += value * math.cos(math.radians(heading))
+                y += value * math.sin(math.radians(heading))
+                points.append((round(x), round(y)))
+
+            else:
+                heading += value
+
+        commands = []
+        if self.waypoints:
+            commands += self.__waypointCommands(points)
+
+        elif points:
+            commands += self.__goCommands((0, 0), points[-1])
+
+        heading = round(self.__wrapAngle(heading))
+        if abs(heading) >= self.min_rotate:
+            direction = "left" if heading > 0 else "right"
+            commands.append(PathCommand("rotate", (direction, abs(heading))))
+
+        return CompiledPath(
+            commands=commands,
+            estimated_time=self.estimateTime(commands),
+            literal_time=self.estimateLiteralTime(path),
+        )
+
+    def __goCommands(self, start: tuple[int], end: tuple[int]) -> list[PathCommand]:
+        """Flies from start to end with go commands, split into pieces when an axis exceeds the limit of the drone"""
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        pieces = math.ceil(max(abs(dx), abs(dy)) / self.MAX_GO)
+
+        if pieces == 0:
+            return []
+
+        commands = []
+        done_x = done_y = 0
+        for piece in range(1, pieces + 1):
+            step_x = round(dx * piece / pieces) - done_x
+            step_y = round(dy * piece / pieces) - done_y
+            done_x, done_y = done_x + step_x, done_y + step_y
+
+            # The drone refuses a go this short, the distance is too small to matter
+            if abs(step_x) <= self.MIN_GO and abs(step_y) <= self.MIN_GO:
+                continue
+
+            commands.append(PathCommand("go", (step_x, step_y, 0, self.speed)))
+
+        return commands
+
+    def __curveRadius(self, a: tuple[int], b: tuple[int]) -> float | None:
+        """:return: The radius of the arc from the current position through a to b, None if the points are in line"""
+        cross = a[0] * b[1] - a[1] * b[0]
+
+        if cross == 0:
+            return None
+
+        return (
+            math.dist((0, 0), a) * math.dist((0, 0), b) * math.dist(a, b)
+        ) / (2 * abs(cross))
+
+    def __validPoint(self, point: tuple[int]) -> bool:
+        """:return: True if the drone accepts the point as a target of curve"""
+        return all(abs(value) <= self.MAX_GO for value in point) and any(
+            abs(value) > self.MIN_GO for value in point
+        )
+
+    @staticmethod
+    def __displacement(commands: list[PathCommand]) -> tuple[int]:
+        """:return: How far the go and curve commands take the drone"""
+        x = y = 0
+        for command in commands:
+            if command.name == "go":
+                x, y = x + command.args[0], y + command.args[1]
+
+            elif command.name == "curve":
+                x, y = x + command.args[3], y + command.args[4]
+
+        return x, y
+
+    def __waypointCommands(self, points: list[tuple[int]]) -> list[PathCommand]:
+        commands = []
+        position = (0, 0)  # Where the commands so far take the drone
+        i = 0
+
+        while i < len(points):
+            if self.curves and i + 1 < len(points):
+                a = (points[i][0] - position[0], points[i][1] - position[1])
+                b = (points[i + 1][0] - position[0], points[i + 1][1] - position[1])
+                radius = self.__curveRadius(a, b)
+
+                if (
+                    radius is not None
+                    and self.MIN_CURVE_RADIUS <= radius <= self.MAX_CURVE_RADIUS
+                    and self.__validPoint(a)
+                    and self.__validPoint(b)
+                ):
+                    speed = min(self.speed, self.MAX_CURVE_SPEED)
+                    commands.append(
+                        PathCommand("curve", (a[0], a[1], 0, b[0], b[1], 0, speed))
+                    )
+                    position = points[i + 1]
+                    i += 2
+                    continue
+
+            # A leg too short for the drone is skipped, the position stays so the next leg makes up for it
+            leg = self.__goCommands(position, points[i])
+            dx, dy = self.__displacement(leg)
+            commands += leg
+            position = (position[0] + dx, position[1] + dy)
+            i += 1
+
+        if points:
+            commands = self.__finishPath(commands, points[-1], position)
+
+        return commands
+
+    def __finishPath(
+        self, commands: list[PathCommand], end: tuple[int], position: tuple[int]
+    ) -> list[PathCommand]:
+        """Makes the commands end at the end of the path when the last leg was too short to be flown, by merging what is left into the previous commands"""
+        remainder = (end[0] - position[0], end[1] - position[1])
+
+        while remainder != (0, 0) and commands:
+            last = commands.pop()
+
+            if last.name == "curve":
+                # The curve becomes a go to its first point, followed by the rest of it and the remainder
+                first = self.__goCommands((0, 0), last.args[:2])
+                rest = (
+                    last.args[3] - last.args[0] + remainder[0],
+                    last.args[4] - last.args[1] + remainder[1],
+                )
+                leg = self.__goCommands((0, 0), rest)
+
+                if self.__displacement(leg) == rest:
+                    return commands + first + leg
+
+                remainder = (last.args[3] + remainder[0], last.args[4] + remainder[1])
+
+            else:
+                remainder = (last.args[0] + remainder[0], last.args[1] + remainder[1])
+
+            leg = self.__goCommands((0, 0), remainder)
+
+            if self.__displacement(leg) == remainder:
+                return commands + leg
+
+        # The whole path is shorter than the drone can fly
+        return commands
+
+    def estimateTime(self, commands: list[PathCommand]) -> float:
+        """:return: Seconds the drone needs to execute the commands"""
+        total = 0.0
+
+        for command in commands:
+            total += self.command_overhead
+
+            if command.name == "go":
+                total += math.hypot(*command.args[:3]) / command.args[3]
+
+            elif command.name == "curve":
+                # The arc is a little longer than the two chords, which are a good enough estimate
+                first = math.hypot(*command.args[:3])
+                second = math.dist(command.args[:3], command.args[3:6])
+                total += (first + second) / command.args[6]
+
+            elif command.name == "rotate":
+                total += command.args[1] / self.yaw_rate
+
+            elif command.name == "move":
+                total += command.args[1] / self.speed
+
+        return total
+
+    def estimateLiteralTime(self, path: list[list]) -> float:
+        """:return: Seconds the path takes when every entry is sent as its own command, with the 40 cm minimum of **Controller.move**"""
+        total = 0.0
+
+        for action, value in path:
+            total += self.command_overhead
+
+            if action == "move":
+                total += max(abs(value), 40) / self.speed
+            else:
+                total += abs(value) / self.yaw_rate
+
+        return total
+
+    @staticmethod
+    def __wrapAngle(angle: float) -> float:
+        """:return: The same rotation between -180 and 180 degrees"""
+        return (angle + 180) % 360 - 180
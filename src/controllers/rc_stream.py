@@ -0,0 +1,234 @@
+import threading
+import time
+import numpy as np
+
+HOVER = (0, 0, 0, 0)
+
+
+class RCStreamer:
+    def __init__(
+        self,
+        drone_controller,
+        rate: float = 30.0,
+        deadman_timeout: float = 0.3,
+        max_step: int = 25,
+        max_value: int = 100,
+    ):
+        """Sends the rc stick values to the drone at a fixed rate from a background thread, so the frame loop only sets the target and never waits for the network.
+
+        The values move towards the target by at most **max_step** per packet, so a jump of the hand does not jerk the drone.
+        If the target is not renewed within **deadman_timeout** seconds (the hand left the frame, the loop stalled) the drone is brought back to hover.
+        Nothing is sent while the drone hovers, apart from the packet that stops it.
+
+        :param drone_controller: **Controller** or **Swarm**, it needs a **send_rc** method
+        :param rate: Packets per second
+        :param deadman_timeout: Seconds after the last target before the values go back to 0
+        :param max_step: Largest change of each value between two packets
+        :param max_value: Limit of the values, the drone accepts up to 100
+        """
+        self.drone_controller = drone_controller
+        self.rate = rate
+        self.deadman_timeout = deadman_timeout
+        self.max_step = max_step
+        self.max_value = min(max_value, 100)
+
+        self.packets_sent = 0
+        self.deadman_stops = 0
+        self.errors = 0
+
+        self.__target = HOVER
+        self.__target_time = 0.0
+        self.__current = HOVER
+        self.__sent = HOVER
+        self.__targets = None
+        self.__sent_targets = None
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__run = False
+
+    @property
+    def running(self) -> bool:
+        return self.__run
+
+    @property
+    def current(self) -> tuple[int]:
+        """:return: The last values sent: left/right, forward/back, up/down and yaw"""
+        return self.__current
+
+    def start(self):
+        """Starts the sender thread"""
+        if self.__run:
+            return
+
+        self.__run = True
+        self.__thread = threading.Thread(
+            target=self.__sendLoop, name="RCStreamer", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self, timeout: float | None = 1.0):
+        """Stops the sender thread, the drone is left hovering"""
+        if not self.__run:
+            return
+
+        self.__run = False
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+        if self.__sent != HOVER:
+            self.__send(HOVER, self.__sent_targets)
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def setTarget(
+        self,
+        left_right: int = 0,
+        forward_back: int = 0,
+        up_down: int = 0,
+        yaw: int = 0,
+        targets: list[str] | None = None,
+    ):
+        """Sets the values the stream moves towards. It has to be called again before the deadman timeout to keep the drone moving.
+
+        :param left_right: Positive to the right
+        :param forward_back: Positive forward
+        :param up_down: Positive up
+        :param yaw: Positive clockwise
+        :param targets: Names of the drones of a **Swarm** that receive the values, None keeps the previous ones. The drones that stop being targeted are brought to hover first.
+        """
+        target = tuple(
+            int(np.clip(value, -self.max_value, self.max_value))
+            for value in (left_right, forward_back, up_down, yaw)
+        )
+
+        with self.__lock:
+            self.__target = target
+            self.__target_time = time.monotonic()
+
+            if targets is not None:
+                self.__targets = list(targets)
+
+    def hover(self):
+        """Brings the drone to a stop at the rate limit"""
+        self.setTarget()
+
+    def __send(self, values: tuple[int], targets: list[str] | None):
+        try:
+            if targets is None:
+                self.drone_controller.send_rc(*values)
+
+            else:
+                self.drone_controller.send_rc(*values, targets=targets)
+
+            self.__sent = values
+            self.__sent_targets = targets
+            self.packets_sent += 1
+
+        except Exception:
+            self.errors += 1
+
+    def __sendLoop(self):
+        interval = 1 / self.rate
+        next_tick = time.monotonic()
+
+        while self.__run:
+            with self.__lock:
+                target = self.__target
+                targets = self.__targets
+
+                if (
+                    target != HOVER
+                    and time.monotonic() - self.__target_time > self.deadman_timeout
+                ):
+                    target = self.__target = HOVER
+                    self.deadman_stops += 1
+
+            # The drones that were moving do not keep the last values when others are selected
+            if targets != self.__sent_targets and self.__sent != HOVER:
+                self.__send(HOVER, self.__sent_targets)
+                self.__current = HOVER
+
+            self.__current = tuple(
+                current + int(np.clip(goal - current, -self.max_step, self.max_step))
+                for current, goal in zip(self.__current, target)
+            )
+
+            if self.__current != HOVER or self.__sent != HOVER:
+                self.__send(self.__current, targets)
+
+            # The ticks are kept on a fixed schedule, a late packet does not shift the next ones
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            else:
+                next_tick = time.monotonic()
+
+
+class RCMapper:
+    def __init__(
+        self, gain: float = 250.0, dead_zone: float = 0.05, max_speed: int = 60
+    ):
+        """Turns the displacement of the hand into rc stick values, like a joystick centered where the gesture started.
+
+        The displacement is measured in fractions of the frame, so it does not depend on the resolution.
+        With the **move** gesture, moving the finger to the right flies forward and moving it up climbs; with the **rotate** gesture, moving the fingers to the right rotates the drone to the left, as in the queued path.
+
+        :param gain: Stick value for a displacement of the whole frame
+        :param dead_zone: Displacement (fraction of the frame) that is ignored, so a still hand keeps the drone still
+        :param max_speed: Limit of the values
+        """
+        self.gain = gain
+        self.dead_zone = dead_zone
+        self.max_speed = max_speed
+        self.__action = None
+        self.__anchor = None
+
+    def reset(self):
+        """Forgets the start of the gesture, the next one is centered where it begins"""
+        self.__action = None
+        self.__anchor = None
+
+    def __axis(self, displacement: float) -> int:
+        if abs(displacement) <= self.dead_zone:
+            return 0
+
+        value = (abs(displacement) - self.dead_zone) * self.gain
+
+        return int(np.copysign(min(value, self.max_speed), displacement))
+
+    def update(
+        self, action: str, point: tuple[float], frame_shape: tuple[int]
+    ) -> tuple[int]:
+        """:param action: move or rotate
+        :param point: Position of the index finger tip in pixels (x, y)
+        :param frame_shape: Height and width of the frame
+        :return: left/right, forward/back, up/down and yaw values for **RCStreamer.setTarget**
+        """
+        height, width = frame_shape[:2]
+        position = (point[0] / width, point[1] / height)
+
+        if action != self.__action:
+            self.__action = action
+            self.__anchor = position
+
+        dx = self.__axis(position[0] - self.__anchor[0])
+        dy = self.__axis(self.__anchor[1] - position[1])  # Up in the image is positive
+
+        if action == "move":
+            return 0, dx, dy, 0
+
+        if action == "rotate":
+            return 0, 0, 0, -dx
+
+        return HOVER
@@ -0,0 +1,288 @@
+import json
+import os
+import time
+import numpy as np
+from ai_core.vision.hand_tracking import (
+    BaseHands,
+    Classification,
+    Handedness,
+    TrackedHands,
+)
+
+
+SESSION_VERSION = 1
+
+# One record per recorded frame, the pixels are appended to frames.bin starting at offset
+FRAME_DTYPE = np.dtype(
+    [
+        ("frame_id", "<u4"),
+        ("timestamp", "<f8"),
+        ("offset", "<u8"),
+        ("height", "<u2"),
+        ("width", "<u2"),
+        ("channels", "u1"),
+    ]
+)
+
+# One record per hand found on a frame, the coordinates are normalized like the ones returned by MediaPipe
+LANDMARK_DTYPE = np.dtype(
+    [
+        ("frame_id", "<u4"),
+        ("timestamp", "<f8"),
+        ("right", "?"),
+        ("score", "<f4"),
+        ("landmarks", "<f4", (21, 3)),
+    ]
+)
+
+
+class SessionRecorder:
+    def __init__(self, path: str, record_frames: bool = True):
+        """Records a session of the gesture pipeline into a directory: the raw frames, the landmarks of the hands, the recognized gestures and the commands sent to the drone.
+
+        Every file is only appended to. The timestamps are seconds on the monotonic clock since the start of the recording.
+        - **frames.bin**: the raw pixels of the frames, one after another
+        - **frames.idx**: a **FRAME_DTYPE** record per frame
+        - **landmarks.bin**: a **LANDMARK_DTYPE** record per hand
+        - **events.jsonl**: a JSON line per gesture or command
+        - **session.json**: the version and the record formats
+
+        :param path: Directory of the session, it is created if needed
+        :param record_frames: If False, only the landmarks and the events are recorded, which makes the session much smaller
+        """
+        if os.path.exists(os.path.join(path, "session.json")):
+            raise FileExistsError(f"A session is already recorded in {path}")
+
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.record_frames = record_frames
+        self.frame_id = -1
+        self.__start = time.monotonic()
+        self.__offset = 0
+
+        with open(os.path.join(path, "session.json"), "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "version": SESSION_VERSION,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "record_frames": record_frames,
+                    "frame_dtype": FRAME_DTYPE.descr,
+                    "landmark_dtype": LANDMARK_DTYPE.descr,
+                },
+                file,
+                indent=4,
+            )
+
+        self.__frames = (
+            open(os.path.join(path, "frames.bin"), "ab") if record_frames else None
+        )
+        self.__index = open(os.path.join(path, "frames.idx"), "ab")
+        self.__landmarks = open(os.path.join(path, "landmarks.bin"), "ab")
+        self.__events = open(os.path.join(path, "events.jsonl"), "a", encoding="utf-8")
+        self.__frame_record = np.zeros(1, dtype=FRAME_DTYPE)
+
+    def timestamp(self) -> float:
+        return time.monotonic() - self.__start
+
+    def recordFrame(self, frame: np.ndarray) -> int:
+        """Registers a captured frame, the landmarks and events recorded next belong to it.
+
+        :param frame: The frame as returned by the frame function, before it is flipped or converted
+        :return: The id of the frame
+        """
+        self.frame_id += 1
+        record = self.__frame_record[0]
+        record["frame_id"] = self.frame_id
+        record["timestamp"] = self.timestamp()
+        record["offset"] = self.__offset
+        record["height"], record["width"] = frame.shape[:2]
+        record["channels"] = frame.shape[2] if frame.ndim == 3 else 1
+
+        if self.__frames is not None:
+            # The pixels are written straight from the array, without a copy when it is contiguous
+            self.__frames.write(np.ascontiguousarray(frame).data)
+            self.__offset += frame.nbytes
+
+        self.__index.write(self.__frame_record.data)
+
+        return self.frame_id
+
+    def recordHands(self, landmarks: list[np.ndarray], handedness: list):
+        """Registers the hands found on the current frame.
+
+        :param landmarks: The (21, 3) arrays with the normalized coordinates of every hand
+        :param handedness: The handedness of every hand, as returned by MediaPipe
+        """
+        records = np.zeros(len(landmarks), dtype=LANDMARK_DTYPE)
+        records["frame_id"] = self.frame_id
+        records["timestamp"] = self.timestamp()
+
+        for record, hand_landmarks, hand_handedness in zip(
+            records, landmarks, handedness
+        ):
+            classification = hand_handedness.classification[0]
+            record["right"] = classification.label == "Right"
+            record["score"] = classification.score
+            record["landmarks"] = hand_landmarks
+
+        self.__landmarks.write(records.data)
+
+    def recordEvent(self, kind: str, name: str, *args):
+        """Registers a recognized gesture or a command sent to the drone.
+
+        :param kind: gesture or command
+        :param name: Name of the gesture or of the command
+        :param args: Parameters of the command
+        """
+        self.__events.write(
+            json.dumps(
+                {
+                    "timestamp": round(self.timestamp(), 6),
+                    "frame_id": self.frame_id,
+                    "kind": kind,
+                    "name": name,
+                    "args": list(args),
+                }
+            )
+            + "\n"
+        )
+
+    def flush(self):
+        for file in (self.__frames, self.__index, self.__landmarks, self.__events):
+            if file is not None:
+                file.flush()
+
+    def close(self):
+        for file in (self.__frames, self.__index, self.__landmarks, self.__events):
+            if file is not None and not file.closed:
+                file.close()
+
+
+class SessionReplay:
+    def __init__(self, path: str, realtime: bool = False, landmarks_only: bool = False):
+        """Plays back a session recorded by **SessionRecorder**. The instance is the frame function of **CameraController**.
+
+        :param path: Directory of the session
+        :param realtime: If True, the frames are returned at the recorded timing, otherwise as fast as they are read
+        :param landmarks_only: If True, black frames of the recorded size are returned instead of the recorded ones, which is also the only option when the frames were not recorded. Use it with **ReplayHands**.
+        """
+        with open(os.path.join(path, "session.json"), "r", encoding="utf-8") as file:
+            self.info = json.load(file)
+
+        if self.info["version"] != SESSION_VERSION:
+            raise ValueError(f"Unsupported session version: {self.info['version']}")
+
+        self.path = path
+        self.realtime = realtime
+        self.landmarks_only = landmarks_only or not self.info["record_frames"]
+        self.index = np.fromfile(os.path.join(path, "frames.idx"), dtype=FRAME_DTYPE)
+        self.landmarks = np.fromfile(
+            os.path.join(path, "landmarks.bin"), dtype=LANDMARK_DTYPE
+        )
+
+        with open(os.path.join(path, "events.jsonl"), "r", encoding="utf-8") as file:
+            self.events = [json.loads(line) for line in file if line.strip()]
+
+        # The frames are read from the disk only when they are returned
+        frames_path = os.path.join(path, "frames.bin")
+        self.__frames = (
+            np.memmap(frames_path, dtype=np.uint8, mode="r")
+            if not self.landmarks_only and os.path.getsize(frames_path)
+            else None
+        )
+        self.__blank = None
+        self.position = -1
+        self.__started_at = None
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.index)
+
+    @property
+    def frame_id(self) -> int | None:
+        """:return: The id of the last returned frame"""
+        if not 0 <= self.position < len(self.index):
+            return None
+
+        return int(self.index[self.position]["frame_id"])
+
+    def rewind(self):
+        self.position = -1
+        self.__started_at = None
+
+    def __call__(self) -> np.ndarray | None:
+        """:return: The next recorded frame, None when the session ended"""
+        if self.position + 1 >= len(self.index):
+            return None
+
+        self.position += 1
+        record = self.index[self.position]
+
+        if self.realtime:
+            now = time.monotonic()
+
+            if self.__started_at is None:
+                self.__started_at = now - record["timestamp"]
+
+            delay = self.__started_at + record["timestamp"] - now
+            if delay > 0:
+                time.sleep(delay)
+
+        shape = (int(record["height"]), int(record["width"]), int(record["channels"]))
+
+        if self.__frames is None:
+            if self.__blank is None or self.__blank.shape != shape:
+                self.__blank = np.zeros(shape, dtype=np.uint8)
+
+            return self.__blank
+
+        offset = int(record["offset"])
+
+        return self.__frames[offset : offset + np.prod(shape)].reshape(shape)
+
+    def handsAt(self, frame_id: int) -> np.ndarray:
+        """:return: The **LANDMARK_DTYPE** records of the hands recorded on the frame"""
+        start, end = np.searchsorted(
+            self.landmarks["frame_id"], (frame_id, frame_id + 1)
+        )
+
+        return self.landmarks[start:end]
+
+
+class ReplayHands(BaseHands):
+    def __init__(self, replay: SessionReplay):
+        """Stands in for the **Hands** class during a replay: the hands recorded on the current frame of the replay are returned, so MediaPipe does not run at all.
+
+        The replay must be the frame function of the **CameraController**, without threaded capture, so that every returned frame is processed.
+
+        :param replay: The replay that returns the frames
+        """
+        self.replay = replay
+
+    def getHands(self, rgb_frame: np.ndarray | None = None) -> TrackedHands | None:
+        """:return: The recorded hands of the current frame in the form returned by **Hands.getHands**, None if there were none"""
+        frame_id = self.replay.frame_id
+        records = self.replay.handsAt(frame_id) if frame_id is not None else ()
+
+        if not len(records):
+            self.hands = None
+
+            return None
+
+        self.hands = TrackedHands(
+            [record["landmarks"] for record in records],
+            [
+                Handedness(
+                    [
+                        Classification(
+                            "Right" if record["right"] else "Left",
+                            float(record["score"]),
+                        )
+                    ]
+                )
+                for record in records
+            ],
+        )
+
+        return self.hands
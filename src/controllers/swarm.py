@@ -0,0 +1,240 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.controllers.drone_controller import Controller, Telemetry
+
+
+class Swarm:
+    def __init__(
+        self,
+        drones: list[dict | Controller],
+        telemetry_max_age: float = 1.0,
+    ):
+        """Controls several drones as if they were one **Controller**, so the same gesture pipeline and **CameraController** drive the whole fleet.
+
+        Each command is sent to every targeted drone at the same time from a pool of threads, so it takes as long as the slowest drone instead of the sum of all of them.
+        Every **Controller** keeps its own telemetry cache.
+
+        :param drones: The parameters of each **Controller** (for example ``{"host": "192.168.0.11", "name": "left"}``) or already connected controllers
+        :param telemetry_max_age: After how many seconds without a new state packet the telemetry of a drone is considered stale
+        """
+        if not drones:
+            raise ValueError("A swarm needs at least one drone")
+
+        self.__pool = ThreadPoolExecutor(
+            max_workers=len(drones), thread_name_prefix="Swarm"
+        )
+
+        names = []
+        for i, drone in enumerate(drones):
+            if isinstance(drone, Controller):
+                names.append(drone.drone.address[0])
+
+            else:
+                names.append(drone.get("name") or drone.get("host") or f"drone{i}")
+
+        if len(set(names)) != len(names):
+            raise ValueError(f"The drones of a swarm need different names: {names}")
+
+        def connect(drone: dict | Controller) -> Controller:
+            if isinstance(drone, Controller):
+                return drone
+
+            parameters = {key: value for key, value in drone.items() if key != "name"}
+
+            return Controller(telemetry_max_age=telemetry_max_age, **parameters)
+
+        # djitellopy opens its shared sockets with the first drone, which is why it is connected alone. Connecting waits for every drone to answer, so the others are connected at the same time.
+        first = connect(drones[0])
+        self.controllers = dict(
+            zip(names, [first, *self.__pool.map(connect, drones[1:])])
+        )
+        self.targets = None  # None sends the commands to every drone
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.controllers)
+
+    @property
+    def selected(self) -> list[str]:
+        """:return: The names of the drones that currently receive the commands"""
+        return list(self.__targeted(None))
+
+    @property
+    def leader(self) -> Controller:
+        """:return: The first drone, the only one whose camera can be received because every Tello streams to the same port"""
+        return next(iter(self.controllers.values()))
+
+    def select(self, targets: str | int | list[str | int] | None = None):
+        """Chooses the drones that receive the next commands.
+
+        :param targets: Names or positions (starting from 1) of the drones, None or 0 for all of them
+        """
+        if targets in (None, 0, "all"):
+            self.targets = None
+
+            return
+
+        if not isinstance(targets, (list, tuple)):
+            targets = [targets]
+
+        selected = []
+        for target in targets:
+            if isinstance(target, int):
+                if not 1 <= target <= len(self.controllers):
+                    raise ValueError(f"There is no drone number {target}")
+
+                target = self.names[target - 1]
+
+            elif target not in self.controllers:
+                raise ValueError(f"Unknown drone: {target}")
+
+            selected.append(target)
+
+        self.targets = selected
+
+    def __targeted(self, targets: list[str] | None) -> dict[str, Controller]:
+        targets = targets if targets is not None else self.targets
+
+        if targets is None:
+            return self.controllers
+
+        return {name: self.controllers[name] for name in targets}
+
+    def dispatch(
+        self, command: str, *args, targets: list[str] | None = None
+    ) -> dict[str, object]:
+        """Calls a method of **Controller** on the targeted drones at the same time and waits for all of them.
+
+        :param command: Name of the method. Example: **move**
+        :param args: Parameters of the method
+        :param targets: Names of the drones, by default the ones chosen with **select**
+        :return: The result of each drone, or the exception it raised
+        """
+        controllers = self.__targeted(targets)
+        futures = {
+            name: self.__pool.submit(getattr(controller, command), *args)
+            for name, controller in controllers.items()
+        }
+        results = {}
+
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+
+            except Exception as err:
+                results[name] = err
+
+        return results
+
+    def __broadcast(self, command: str, *args, targets: list[str] | None = None):
+        """Like **dispatch**, but an error of any drone is raised after all of them answered, so the command executor marks the command as failed"""
+        errors = {
+            name: result
+            for name, result in self.dispatch(command, *args, targets=targets).items()
+            if isinstance(result, Exception)
+        }
+
+        if errors:
+            raise RuntimeError(
+                "; ".join(f"{name}: {err}" for name, err in errors.items())
+            )
+
+    def telemetries(self, max_age: float | None = None) -> dict[str, Telemetry | None]:
+        """:return: The cached telemetry of every drone, None for the stale ones"""
+        return {
+            name: controller.get_telemetry(max_age)
+            for name, controller in self.controllers.items()
+        }
+
+    def get_telemetry(self, max_age: float | None = None) -> Telemetry | None:
+        """:return: The telemetry of the targeted drones combined as if they were one: flying only if all of them fly, the lowest height and battery. None if any of them is stale."""
+        telemetries = [
+            controller.get_telemetry(max_age)
+            for controller in self.__targeted(None).values()
+        ]
+
+        if any(telemetry is None for telemetry in telemetries):
+            return None
+
+        first = telemetries[0]
+
+        return Telemetry(
+            timestamp=min(telemetry.timestamp for telemetry in telemetries),
+            height=min(telemetry.height for telemetry in telemetries),
+            battery=min(telemetry.battery for telemetry in telemetries),
+            pitch=first.pitch,
+            roll=first.roll,
+            yaw=first.yaw,
+            flying=all(telemetry.flying for telemetry in telemetries),
+        )
+
+    def get_battery(self) -> int | None:
+        telemetry = self.get_telemetry()
+
+        return telemetry.battery if telemetry else None
+
+    def get_height(self) -> int | None:
+        telemetry = self.get_telemetry()
+
+        return telemetry.height if telemetry else None
+
+    def run_camera(self, frame_read: bool = True):
+        self.leader.run_camera(frame_read)
+
+    def get_capture(self) -> np.ndarray | None:
+        return self.leader.get_capture()
+
+    # The flight commands take the drones they were queued for, a selection made in the meantime does not redirect them
+    def run(self, targets: list[str] | None = None):
+        self.__broadcast("run", targets=targets)
+
+    def stop(self, targets: list[str] | None = None):
+        self.__broadcast("stop", targets=targets)
+
+    def move(self, direction: str, d: int | float, targets: list[str] | None = None):
+        self.__broadcast("move", direction, d, targets=targets)
+
+    def move2(self, direction: str, d: int | float, targets: list[str] | None = None):
+        self.__broadcast("move2", direction, d, targets=targets)
+
+    def rotate(self, direction: str, d: int | float, targets: list[str] | None = None):
+        self.__broadcast("rotate", direction, d, targets=targets)
+
+    def rotate2(
+        self, direction: str, d: int | float, targets: list[str] | None = None
+    ):
+        self.__broadcast("rotate2", direction, d, targets=targets)
+
+    def send_rc(
+        self,
+        left_right: int,
+        forward_back: int,
+        up_down: int,
+        yaw: int,
+        targets: list[str] | None = None,
+    ):
+        self.__broadcast(
+            "send_rc", left_right, forward_back, up_down, yaw, targets=targets
+        )
+
+    def go(self, x: int, y: int, z: int, speed: int, targets: list[str] | None = None):
+        self.__broadcast("go", x, y, z, speed, targets=targets)
+
+    def curve(
+        self,
+        x1: int,
+        y1: int,
+        z1: int,
+        x2: int,
+        y2: int,
+        z2: int,
+        speed: int,
+        targets: list[str] | None = None,
+    ):
+        self.__broadcast("curve", x1, y1, z1, x2, y2, z2, speed, targets=targets)
+
+    def close(self):
+        for controller in self.controllers.values():
+            controller.close()
+
+        self.__pool.shutdown(wait=False)
@@ -0,0 +1 @@
+from .tello import TelloSimulator
@@ -0,0 +1,4 @@
+from .tello import main
+
+
+main()
@@ -0,0 +1,508 @@
+import argparse
+import math
+import socket
+import threading
+import time
+from fractions import Fraction
+import cv2
+import numpy as np
+
+
+class TelloSimulator:
+    TAKEOFF_HEIGHT = 80  # cm
+    VIDEO_CHUNK_SIZE = 1460  # The Tello splits the H.264 stream into datagrams of this size
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        control_port: int = 9889,
+        state_port: int = 8890,
+        video_port: int = 11111,
+        command_delay: float = 0.05,
+        speed: float = 100,
+        yaw_rate: float = 90,
+        takeoff_time: float = 2.0,
+        state_rate: float = 10,
+        video: str | None = None,
+        video_size: tuple[int] = (960, 720),
+        video_fps: float = 30,
+    ):
+        """Local imitation of a Tello drone that speaks the SDK over UDP.
+
+        It answers the commands after a configurable delay, keeps a simulated position for the move/rotate/go/curve/rc commands, sends the state packets to the client and can stream a synthetic video.
+
+        djitellopy binds the control port 8889 on every interface, so on the same machine the simulator has to listen on another port (see **Controller(control_port=...)**). To simulate several drones, give each one its own loopback address (127.0.0.2, 127.0.0.3, ...), djitellopy tells the drones apart by their IP.
+
+        :param host: Address the simulator listens on and sends from
+        :param control_port: Port for the SDK commands
+        :param state_port: Port of the client where the state packets are sent
+        :param video_port: Port of the client where the video is sent
+        :param command_delay: Seconds before a command is answered
+        :param speed: Flight speed in cm/s used for the moves, unless the command sets it
+        :param yaw_rate: Rotation speed in degrees/s
+        :param takeoff_time: Seconds the takeoff and the landing take
+        :param state_rate: State packets per second
+        :param video: "h264" for an H.264 stream like the real drone, "raw" for raw bgr24 frames or None for no video
+        :param video_size: Width and height of the video
+        :param video_fps: Frames per second of the video
+        """
+        self.host = host
+        self.control_port = control_port
+        self.state_port = state_port
+        self.video_port = video_port
+        self.command_delay = command_delay
+        self.speed = speed
+        self.yaw_rate = yaw_rate
+        self.takeoff_time = takeoff_time
+        self.state_rate = state_rate
+        self.video = video
+        self.video_size = tuple(video_size)
+        self.video_fps = video_fps
+
+        self.__lock = threading.Lock()
+        self.__run = False
+        self.__threads = []
+        self.__client = None  # IP of the client that entered the SDK mode
+        self.__stream_on = False
+        self.__rc = (0, 0, 0, 0)
+        self.__rc_time = 0.0
+        self.__flight_started = None
+
+        # Position in cm (x forward at yaw 0, y to the right, z up) and yaw in degrees, clockwise
+        self.x = self.y = self.z = 0.0
+        self.yaw = 0.0
+        self.battery = 100.0
+        self.flying = False
+        self.commands = []  # (time.monotonic(), command) of every command received
+
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__socket.bind((host, control_port))
+        self.__socket.settimeout(0.2)
+        self.__state_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__state_socket.bind((host, 0))
+        self.__video_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__video_socket.bind((host, 0))
+
+    @property
+    def pose(self) -> tuple[float]:
+        """:return: x, y, z in cm and yaw in degrees"""
+        with self.__lock:
+            return self.x, self.y, self.z, self.yaw
+
+    def start(self):
+        """Starts answering commands in the background"""
+        if self.__run:
+            return
+
+        self.__run = True
+        self.__threads = [
+            threading.Thread(target=target, name=name, daemon=True)
+            for target, name in (
+                (self.__commandLoop, "TelloSimulatorCommands"),
+                (self.__stateLoop, "TelloSimulatorState"),
+                (self.__videoLoop, "TelloSimulatorVideo"),
+            )
+        ]
+
+        for thread in self.__threads:
+            thread.start()
+
+    def stop(self):
+        self.__run = False
+
+        for thread in self.__threads:
+            thread.join(1.0)
+
+        self.__threads = []
+
+    def close(self):
+        self.stop()
+        self.__socket.close()
+        self.__state_socket.close()
+        self.__video_socket.close()
+
+    def serve_forever(self):
+        """Answers commands until the process is interrupted"""
+        self.start()
+
+        try:
+            while self.__run:
+                time.sleep(0.5)
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self.close()
+
+    def __commandLoop(self):
+        # Like the real drone, the commands are executed one at a time, the next ones wait in the socket buffer.
+        while self.__run:
+            try:
+                data, address = self.__socket.recvfrom(1024)
+
+            except socket.timeout:
+                continue
+
+            except OSError:
+                break
+
+            command = data.decode("utf-8", errors="replace").strip()
+            self.commands.append((time.monotonic(), command))
+            response = self.execute(command, address[0])
+
+            if response is not None:
+                self.__socket.sendto(response.encode("utf-8"), address)
+
+    def execute(self, command: str, client: str | None = None) -> str | None:
+        """Executes an SDK command and blocks as long as the drone would.
+
+        :param command: The SDK command. Example: "forward 50"
+        :param client: IP of the client, the state and the video are sent to it
+        :return: The answer of the drone, None for the commands without answer (rc)
+        """
+        if not command.split():
+            return "error"
+
+        name, *args = command.split()
+
+        try:
+            args = [int(float(arg)) for arg in args]
+
+        except ValueError:
+            return "error"
+
+        if name == "rc":
+            if len(args) != 4:
+                return None
+
+            with self.__lock:
+                self.__integrateRc()
+                self.__rc = tuple(max(-100, min(100, arg)) for arg in args)
+
+            return None
+
+        if name.endswith("?"):
+            time.sleep(self.command_delay)
+
+            return self.__query(name)
+
+        time.sleep(self.command_delay)
+
+        if name == "command":
+            self.__client = client or self.__client
+
+            return "ok"
+
+        if name == "takeoff":
+            if not self.flying:
+                self.__animate(self.takeoff_time, dz=self.TAKEOFF_HEIGHT - self.z)
+                self.flying = True
+                self.__flight_started = time.monotonic()
+
+            return "ok"
+
+        if name == "land":
+            self.__animate(self.takeoff_time, dz=-self.z)
+            self.flying = False
+            self.__rc = (0, 0, 0, 0)
+
+            return "ok"
+
+        if name == "emergency":
+            with self.__lock:
+                self.z, self.flying, self.__rc = 0.0, False, (0, 0, 0, 0)
+
+            return "ok"
+
+        if name in ("streamon", "streamoff"):
+            self.__stream_on = name == "streamon"
+
+            return "ok"
+
+        if name in ("keepalive", "motoron", "motoroff", "downvision", "port"):
+            return "ok"
+
+        if name == "speed":
+            if len(args) != 1 or not 10 <= args[0] <= 100:
+                return "error"
+
+            self.speed = args[0]
+
+            return "ok"
+
+        if name in ("up", "down", "left", "right", "forward", "back"):
+            if len(args) != 1 or not 20 <= args[0] <= 500:
+                return "error"
+
+            if not self.flying:
+                return "error Not flying"
+
+            d = args[0]
+            forward, right, up = {
+                "forward": (d, 0, 0),
+                "back": (-d, 0, 0),
+                "right": (0, d, 0),
+                "left": (0, -d, 0),
+                "up": (0, 0, d),
+                "down": (0, 0, -d),
+            }[name]
+            self.__moveBody(forward, right, up, self.speed)
+
+            return "ok"
+
+        if name in ("cw", "ccw"):
+            if len(args) != 1 or not 1 <= args[0] <= 3600:
+                return "error"
+
+            if not self.flying:
+                return "error Not flying"
+
+            degrees = args[0] if name == "cw" else -args[0]
+            self.__animate(abs(degrees) / self.yaw_rate, dyaw=degrees)
+
+            return "ok"
+
+        if name == "go":
+            if len(args) != 4 or not self.__validTarget(args[:3], args[3], 100):
+                return "error"
+
+            if not self.flying:
+                return "error Not flying"
+
+            # go x y z: x forward, y to the left, z up
+            self.__moveBody(args[0], -args[1], args[2], args[3])
+
+            return "ok"
+
+        if name == "curve":
+            if (
+                len(args) != 7
+                or not self.__validTarget(args[0:3], args[6], 60)
+                or not self.__validTarget(args[3:6], args[6], 60)
+            ):
+                return "error"
+
+            if not self.flying:
+                return "error Not flying"
+
+            # The arc is flown as a straight line to the end point, a little slower
+            self.__moveBody(args[3], -args[4], args[5], args[6], length_factor=1.2)
+
+            return "ok"
+
+        return "error"
+
+    def __validTarget(self, target: list[int], speed: int, max_speed: int) -> bool:
+        return (
+            all(-500 <= value <= 500 for value in target)
+            and not all(-20 <= value <= 20 for value in target)
+            and 10 <= speed <= max_speed
+        )
+
+    def __query(self, name: str) -> str:
+        with self.__lock:
+            return {
+                "battery?": f"{int(self.battery)}",
+                "height?": f"{int(self.z) // 10}dm",
+                "speed?": f"{float(self.speed)}",
+                "time?": f"{self.__flightTime()}s",
+                "wifi?": "90",
+                "sdk?": "20",
+                "sn?": "0TQSIMULATOR",
+            }.get(name, "error")
+
+    def __flightTime(self) -> int:
+        if self.__flight_started is None:
+            return 0
+
+        return int(time.monotonic() - self.__flight_started)
+
+    def __moveBody(
+        self,
+        forward: float,
+        right: float,
+        up: float,
+        speed: float,
+        length_factor: float = 1.0,
+    ):
+        """Moves relative to the direction the drone faces"""
+        yaw = math.radians(self.yaw)
+        dx = forward * math.cos(yaw) - right * math.sin(yaw)
+        dy = forward * math.sin(yaw) + right * math.cos(yaw)
+        length = math.sqrt(forward**2 + right**2 + up**2) * length_factor
+
+        self.__animate(length / max(speed, 1), dx=dx, dy=dy, dz=up)
+
+    def __animate(
+        self,
+        duration: float,
+        dx: float = 0,
+        dy: float = 0,
+        dz: float = 0,
+        dyaw: float = 0,
+    ):
+        """Changes the pose gradually over the duration, so the state packets follow the movement"""
+        steps = max(1, int(duration / 0.05))
+
+        for _ in range(steps):
+            with self.__lock:
+                self.x += dx / steps
+                self.y += dy / steps
+                self.z = max(0.0, self.z + dz / steps)
+                self.yaw = (self.yaw + dyaw / steps + 180) % 360 - 180
+
+            time.sleep(duration / steps)
+
+    def __integrateRc(self):
+        """Applies the rc velocities since the previous call, rc 100 is taken as 100 cm/s and yaw_rate degrees/s"""
+        now = time.monotonic()
+        dt, self.__rc_time = now - self.__rc_time, now
+
+        if not self.flying or dt > 1.0:
+            return
+
+        left_right, forward_back, up_down, yaw = self.__rc
+        self.z = max(0.0, self.z + up_down * dt)
+        self.yaw = (self.yaw + yaw / 100 * self.yaw_rate * dt + 180) % 360 - 180
+
+        rad = math.radians(self.yaw)
+        self.x += (forward_back * math.cos(rad) - left_right * math.sin(rad)) * dt
+        self.y += (forward_back * math.sin(rad) + left_right * math.cos(rad)) * dt
+
+    def __stateLoop(self):
+        while self.__run:
+            time.sleep(1 / self.state_rate)
+
+            with self.__lock:
+                self.__integrateRc()
+
+                if self.flying:
+                    self.battery = max(0.0, self.battery - 0.01 / self.state_rate)
+
+                state = (
+                    f"mid:-1;x:0;y:0;z:0;mpry:0,0,0;pitch:0;roll:0;yaw:{int(self.yaw)};"
+                    f"vgx:0;vgy:0;vgz:0;templ:60;temph:62;tof:{int(self.z) + 10};"
+                    f"h:{int(self.z)};bat:{int(self.battery)};baro:{self.z / 100:.2f};"
+                    f"time:{self.__flightTime()};agx:0.00;agy:0.00;agz:-1000.00;\r\n"
+                )
+
+            if self.__client is not None:
+                try:
+                    self.__state_socket.sendto(
+                        state.encode("ascii"), (self.__client, self.state_port)
+                    )
+
+                except OSError:
+                    pass
+
+    def __syntheticFrame(self, frame_index: int) -> np.ndarray:
+        width, height = self.video_size
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[...] = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+        frame[..., 1] = (frame_index * 4) % 256
+
+        x, y, z, yaw = self.pose
+        cv2.putText(
+            frame,
+            f"x:{x:.0f} y:{y:.0f} z:{z:.0f} yaw:{yaw:.0f} frame:{frame_index}",
+            (20, 40),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1,
+            (255, 255, 255),
+            2,
+        )
+
+        return frame
+
+    def __videoLoop(self):
+        if self.video is None:
+            return
+
+        encoder = None
+        if self.video == "h264":
+            import av  # Installed together with djitellopy
+
+            encoder = av.CodecContext.create("libx264", "w")
+            encoder.width, encoder.height = self.video_size
+            encoder.pix_fmt = "yuv420p"
+            encoder.time_base = Fraction(1, int(self.video_fps))
+            # The headers are repeated with every keyframe, so a client can join the stream at any time
+            encoder.options = {
+                "preset": "ultrafast",
+                "tune": "zerolatency",
+                "x264-params": f"keyint={int(self.video_fps)}:repeat-headers=1",
+            }
+
+        frame_index = 0
+        next_frame = time.monotonic()
+
+        while self.__run:
+            next_frame += 1 / self.video_fps
+            time.sleep(max(0.0, next_frame - time.monotonic()))
+
+            if not self.__stream_on or self.__client is None:
+                continue
+
+            frame = self.__syntheticFrame(frame_index)
+            frame_index += 1
+
+            if encoder is not None:
+                video_frame = av.VideoFrame.from_ndarray(frame, format="bgr24")
+                video_frame.pts = frame_index
+                data = b"".join(bytes(packet) for packet in encoder.encode(video_frame))
+                chunk_size = self.VIDEO_CHUNK_SIZE
+
+            else:
+                data = frame.tobytes()
+                chunk_size = 65000
+
+            for i in range(0, len(data), chunk_size):
+                try:
+                    self.__video_socket.sendto(
+                        data[i : i + chunk_size], (self.__client, self.video_port)
+                    )
+
+                except OSError:
+                    break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Tello SDK simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--control-port", type=int, default=9889)
+    parser.add_argument("--state-port", type=int, default=8890)
+    parser.add_argument("--video-port", type=int, default=11111)
+    parser.add_argument(
+        "--command-delay",
+        type=float,
+        default=0.05,
+        help="Seconds before a command is answered",
+    )
+    parser.add_argument("--speed", type=float, default=100, help="cm/s")
+    parser.add_argument("--yaw-rate", type=float, default=90, help="degrees/s")
+    parser.add_argument("--takeoff-time", type=float, default=2.0, help="seconds")
+    parser.add_argument("--video", choices=("h264", "raw"))
+    parser.add_argument("--video-size", type=int, nargs=2, default=(960, 720))
+    parser.add_argument("--video-fps", type=float, default=30)
+    args = parser.parse_args()
+
+    simulator = TelloSimulator(
+        host=args.host,
+        control_port=args.control_port,
+        state_port=args.state_port,
+        video_port=args.video_port,
+        command_delay=args.command_delay,
+        speed=args.speed,
+        yaw_rate=args.yaw_rate,
+        takeoff_time=args.takeoff_time,
+        video=args.video,
+        video_size=args.video_size,
+        video_fps=args.video_fps,
+    )
+    print(f"Tello simulator listening on {args.host}:{args.control_port}")
+    simulator.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
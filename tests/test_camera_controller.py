@@ -0,0 +1,89 @@
+import numpy as np
+from ai_core.vision import HandLandmark
+from ai_core.vision.hand_tracking import Classification, Handedness
+from benchmarks.fakes import FakeController
+from src.controllers import CameraController
+from src.controllers.session_recorder import ReplayHands, SessionRecorder, SessionReplay
+
+WIDTH, HEIGHT = 640, 480
+FINGERS = (
+    (
+        HandLandmark.INDEX_FINGER_MCP,
+        HandLandmark.INDEX_FINGER_DIP,
+        HandLandmark.INDEX_FINGER_TIP,
+    ),
+    (
+        HandLandmark.MIDDLE_FINGER_MCP,
+        HandLandmark.MIDDLE_FINGER_DIP,
+        HandLandmark.MIDDLE_FINGER_TIP,
+    ),
+    (
+        HandLandmark.RING_FINGER_MCP,
+        HandLandmark.RING_FINGER_DIP,
+        HandLandmark.RING_FINGER_TIP,
+    ),
+    (HandLandmark.PINKY_MCP, HandLandmark.PINKY_DIP, HandLandmark.PINKY_TIP),
+)
+
+
+def hand(extended: tuple[bool], index_x: float) -> np.ndarray:
+    """:return: The normalized landmarks of an upright right hand with the given fingers extended"""
+    landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+    landmarks[HandLandmark.WRIST, 1] = 0.9
+
+    for (mcp, dip, tip), up in zip(FINGERS, extended):
+        landmarks[mcp, 1] = 0.5
+        landmarks[dip, 1] = 0.3 if up else 0.6
+        landmarks[tip, 1] = 0.2 if up else 0.65
+
+    landmarks[HandLandmark.INDEX_FINGER_TIP, 0] = index_x
+
+    return landmarks
+
+
+def replay(tmp_path, frames: list[np.ndarray]) -> CameraController:
+    """Runs a recorded session with the given hands through the whole loop, with a fake drone"""
+    recorder = SessionRecorder(str(tmp_path / "session"), record_frames=False)
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    for landmarks in frames:
+        recorder.recordFrame(frame)
+        recorder.recordHands(
+            [landmarks], [Handedness([Classification("Right", 0.9)])]
+        )
+
+    recorder.close()
+
+    session = SessionReplay(str(tmp_path / "session"))
+    camera = CameraController(
+        get_frame_function=session,
+        drone_controller=FakeController(),
+        hands=ReplayHands(session),
+        headless=True,
+        threaded_capture=False,
+        max_frames=session.frame_count,
+        stats_interval=0,
+    )
+    camera.running()
+
+    return camera
+
+
+def test_released_move_does_not_follow_the_next_pose(tmp_path):
+    fist = (False, False, False, False)
+    pointing = (True, False, False, False)
+    # The finger only starts moving once the move gesture is confirmed
+    moves = [0.3] * 4 + [0.3 + 0.01 * i for i in range(20)]
+
+    # start takes off, the finger moves to the right, then the fist (start) runs the path
+    frames = [hand(fist, 0.3)] * 6
+    frames += [hand(pointing, x) for x in moves]
+    frames += [hand(fist, 0.3)] * 6
+    camera = replay(tmp_path, frames)
+
+    # The fist of the first frames after the move, still accepted as move, is not part of the path
+    distance = int(moves[-1] * WIDTH) - int(moves[0] * WIDTH)
+    expected = camera.path_compiler.compile([["move", distance]])
+
+    assert camera.compiled_path is not None
+    assert camera.compiled_path.commands == expected.commands
@@ -0,0 +1,63 @@
+import os
+import shutil
+import time
+import cv2
+import numpy as np
+import pytest
+from src.controllers.ffmpeg_source import FFmpegFrameSource
+
+WIDTH, HEIGHT = 160, 120
+
+
+@pytest.fixture
+def video(tmp_path) -> str:
+    """:return: A short video where the frame number is written in the first pixel"""
+    path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (WIDTH, HEIGHT))
+
+    for i in range(30):
+        writer.write(np.full((HEIGHT, WIDTH, 3), i * 8, dtype=np.uint8))
+
+    writer.release()
+
+    return path
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_reads_a_local_file(video):
+    frames = []
+
+    with FFmpegFrameSource(video, restart=False, timeout=1.0) as source:
+        while (frame := source()) is not None:
+            frames.append(int(frame[HEIGHT // 2, WIDTH // 2, 0]))
+
+    assert source.frames_read == 30
+    assert frames and frames == sorted(frames)
+    assert source.frames_read == len(frames) + source.dropped_frames
+
+
+def test_missing_ffmpeg_is_raised_on_start(tmp_path):
+    source = FFmpegFrameSource("video.avi", ffmpeg=str(tmp_path / "missing"))
+
+    with pytest.raises(FileNotFoundError):
+        source()
+
+    assert not source.running
+
+
+@pytest.mark.skipif(os.name == "nt", reason="The fake ffmpeg is a shell script")
+def test_failed_restart_is_retried(tmp_path):
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text("#!/bin/sh\nexit 1\n")
+    ffmpeg.chmod(0o755)
+
+    with FFmpegFrameSource(
+        "video.avi", ffmpeg=str(ffmpeg), restart_delay=0.05
+    ) as source:
+        # The executable disappears, every restart fails until it is back
+        ffmpeg.unlink()
+        time.sleep(0.3)
+
+        assert source.running
+        assert source.restarts >= 2
+        assert source() is None
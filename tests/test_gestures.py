@@ -0,0 +1,206 @@
+import numpy as np
+import pytest
+from ai_core.vision import HandLandmark
+from ai_core.vision.gestures import GestureDebouncer, GestureRecognizer
+
+WRIST = HandLandmark.WRIST
+THUMB_TIP = HandLandmark.THUMB_TIP
+MCP = (
+    HandLandmark.INDEX_FINGER_MCP,
+    HandLandmark.MIDDLE_FINGER_MCP,
+    HandLandmark.RING_FINGER_MCP,
+    HandLandmark.PINKY_MCP,
+)
+DIP = (
+    HandLandmark.INDEX_FINGER_DIP,
+    HandLandmark.MIDDLE_FINGER_DIP,
+    HandLandmark.RING_FINGER_DIP,
+    HandLandmark.PINKY_DIP,
+)
+
+
+def if_chain(landmarks: np.ndarray) -> str | None:
+    """The classification that **CameraController** did before the gesture registry, condition by condition"""
+    y = landmarks[:, 1]
+    index, middle, ring, pinky = zip(MCP, DIP)
+
+    if not all(y[WRIST] > y[dip] for dip in DIP):
+        return None
+
+    if all(y[mcp] < y[dip] for mcp, dip in (index, middle, ring, pinky)):
+        return "start"
+
+    if y[THUMB_TIP] - 50 > y[index[0]] and all(
+        y[mcp] > y[dip] for mcp, dip in (index, middle, ring, pinky)
+    ):
+        return "stop"
+
+    if all(y[mcp] > y[dip] for mcp, dip in (index, middle, ring, pinky)):
+        return "wait"
+
+    if y[index[0]] > y[index[1]] and all(
+        y[mcp] < y[dip] for mcp, dip in (middle, ring, pinky)
+    ):
+        return "move"
+
+    if (
+        y[index[0]] > y[index[1]]
+        and y[middle[0]] > y[middle[1]]
+        and all(y[mcp] < y[dip] for mcp, dip in (ring, pinky))
+    ):
+        return "rotate"
+
+    return None
+
+
+def random_hands(rng: np.random.Generator, count: int) -> np.ndarray:
+    """:return: Pixel coordinates of hands, with the joints of each finger close enough to often tie or cross"""
+    hands = rng.integers(0, 480, size=(count, 21, 3)).astype(np.float32)
+    hands[:, WRIST, 1] = rng.integers(200, 480, size=count)
+    hands[:, MCP, 1] = rng.integers(100, 300, size=(count, len(MCP)))
+    hands[:, DIP, 1] = hands[:, MCP, 1] + rng.integers(-40, 41, size=(count, 4))
+    hands[:, THUMB_TIP, 1] = hands[:, MCP[0], 1] + rng.integers(-20, 120, count)
+
+    return hands
+
+
+def test_default_gestures_match_the_if_chain():
+    recognizer = GestureRecognizer()
+    found = set()
+
+    for landmarks in random_hands(np.random.default_rng(0), 100_000):
+        gesture = recognizer.classify(landmarks)
+        name = gesture.name if gesture is not None else None
+
+        assert name == if_chain(landmarks)
+        found.add(name)
+
+    assert found == {"start", "stop", "wait", "move", "rotate", None}
+
+
+def test_registry_order():
+    recognizer = GestureRecognizer()
+    assert [g.name for g in recognizer.gestures] == [
+        "start",
+        "stop",
+        "wait",
+        "move",
+        "rotate",
+    ]
+
+    # A new gesture is checked last, unless its position is given
+    palm = recognizer.register("palm", upright=True, index_extended=True)
+    assert palm.label == "palm"
+    assert recognizer.gestures[-1] == palm
+
+    # Registering the same name again replaces the gesture
+    recognizer.register("palm", "Palm", 0, upright=True, index_extended=True)
+    assert [g.name for g in recognizer.gestures][:2] == ["palm", "start"]
+    assert len(recognizer.gestures) == 6
+
+    recognizer.unregister("palm")
+    recognizer.unregister("start")
+    assert [g.name for g in recognizer.gestures] == [
+        "stop",
+        "wait",
+        "move",
+        "rotate",
+    ]
+
+    with pytest.raises(ValueError):
+        recognizer.register("bad", thumb_up=True)
+
+
+def test_registered_gesture_takes_precedence():
+    recognizer = GestureRecognizer()
+    hands = random_hands(np.random.default_rng(1), 2000)
+    moves = [hand for hand in hands if if_chain(hand) == "move"]
+    assert moves
+
+    recognizer.register("point", index=0, upright=True, index_extended=True)
+
+    for hand in moves:
+        assert recognizer.classify(hand).name == "point"
+
+    recognizer.unregister("point")
+
+    for hand in moves:
+        assert recognizer.classify(hand).name == "move"
+
+
+def test_registry_without_defaults():
+    recognizer = GestureRecognizer(register_defaults=False)
+    landmarks = random_hands(np.random.default_rng(2), 1)[0]
+
+    assert recognizer.gestures == ()
+    assert recognizer.classify(landmarks) is None
+
+
+@pytest.fixture
+def gestures():
+    return {gesture.name: gesture for gesture in GestureRecognizer().gestures}
+
+
+def feed(debouncer: GestureDebouncer, sequence: list) -> list:
+    """:return: The accepted gesture name after each classification"""
+    accepted = []
+
+    for gesture in sequence:
+        result = debouncer.update(gesture)
+        accepted.append(result.name if result is not None else None)
+
+    return accepted
+
+
+def test_debouncer_confirms_after_enough_frames(gestures):
+    debouncer = GestureDebouncer(window=5, confirm=3, release=3)
+    move = gestures["move"]
+
+    assert feed(debouncer, [move, move]) == [None, None]
+    assert not debouncer.changed
+    assert feed(debouncer, [move]) == ["move"]
+    assert debouncer.changed
+    assert feed(debouncer, [move]) == ["move"]
+    assert not debouncer.changed
+
+
+def test_debouncer_ignores_a_single_misclassified_frame(gestures):
+    debouncer = GestureDebouncer(window=5, confirm=3, release=3)
+    move, rotate = gestures["move"], gestures["rotate"]
+
+    feed(debouncer, [move] * 3)
+    rejected = debouncer.rejected
+    assert feed(debouncer, [rotate, move, None, move]) == ["move"] * 4
+    assert debouncer.rejected == rejected + 1
+
+    # A gesture shown for long enough replaces the accepted one
+    feed(debouncer, [rotate, rotate, rotate])
+    assert debouncer.gesture is rotate
+
+
+def test_debouncer_release_hysteresis(gestures):
+    debouncer = GestureDebouncer(window=5, confirm=3, release=3)
+    move = gestures["move"]
+
+    feed(debouncer, [move] * 3)
+    assert feed(debouncer, [None, None, move]) == ["move"] * 3
+    assert feed(debouncer, [None, None, None]) == ["move", "move", None]
+    assert debouncer.changed
+
+    debouncer.reset()
+    assert debouncer.gesture is None
+    assert feed(debouncer, [move, move]) == [None, None]
+
+
+def test_debouncer_confirm_frames(gestures):
+    debouncer = GestureDebouncer(
+        window=5, confirm=3, release=3, confirm_frames={"start": 5}
+    )
+    start, wait = gestures["start"], gestures["wait"]
+
+    assert debouncer.window == 5
+    assert feed(debouncer, [start] * 5) == [None] * 4 + ["start"]
+    assert feed(debouncer, [wait] * 3) == ["start", "start", "wait"]
+
+    # The window grows to hold the confirmation of every gesture
+    assert GestureDebouncer(window=3, confirm_frames={"stop": 6}).window == 6
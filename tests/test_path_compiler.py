@@ -0,0 +1,94 @@
+import math
+import random
+import pytest
+from src.controllers.path_compiler import PathCompiler
+
+
+def endpoint(compiler: PathCompiler, path: list[list]) -> tuple[int]:
+    """:return: Where the simplified path ends, x forward and y to the left"""
+    x = y = heading = 0.0
+
+    for action, value in compiler.simplify(path):
+        if action == "move":
+            x += value * math.cos(math.radians(heading))
+            y += value * math.sin(math.radians(heading))
+
+        else:
+            heading += value
+
+    return round(x), round(y)
+
+
+def displacement(commands) -> tuple[int]:
+    x = y = 0
+
+    for command in commands:
+        if command.name == "go":
+            x, y = x + command.args[0], y + command.args[1]
+
+        elif command.name == "curve":
+            x, y = x + command.args[3], y + command.args[4]
+
+    return x, y
+
+
+def random_path(rng: random.Random) -> list[list]:
+    return [
+        (
+            ["move", rng.randint(-150, 150)]
+            if rng.random() < 0.6
+            else ["rotate", rng.randint(-120, 120)]
+        )
+        for _ in range(rng.randint(1, 30))
+    ]
+
+
+PATHS = [
+    [["move", 25], ["rotate", 45], ["move", 25], ["rotate", -45]] * 10,
+    [["move", 88], ["rotate", 90], ["move", 100], ["rotate", 45]],
+    [["move", 1200]],
+    [["move", 30], ["rotate", 90], ["move", 21], ["rotate", 90], ["move", 30]],
+] + [random_path(random.Random(seed)) for seed in range(200)]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(waypoints=False),
+        dict(waypoints=True, curves=False),
+        dict(waypoints=True, curves=True),
+    ],
+)
+def test_commands_end_at_the_end_of_the_path(options):
+    compiler = PathCompiler(**options)
+
+    for path in PATHS:
+        end = endpoint(compiler, path)
+
+        # The drone cannot fly a path that ends this close to where it started
+        if abs(end[0]) <= PathCompiler.MIN_GO and abs(end[1]) <= PathCompiler.MIN_GO:
+            continue
+
+        commands = compiler.compile(path).commands
+        assert displacement(commands) == end, path
+
+        for command in commands:
+            if command.name == "go":
+                assert all(abs(value) <= PathCompiler.MAX_GO for value in command.args[:3])
+                assert any(abs(value) > PathCompiler.MIN_GO for value in command.args[:3])
+
+
+def test_reported_path_ends_at_its_endpoint():
+    path = [["move", 25], ["rotate", 45], ["move", 25], ["rotate", -45]] * 10
+
+    for curves in (True, False):
+        commands = PathCompiler(waypoints=True, curves=curves).compile(path).commands
+        assert displacement(commands) == (427, 177)
+
+
+def test_short_moves_are_merged_across_small_rotations():
+    path = [["move", 15], ["rotate", 2]] * 10
+    compiler = PathCompiler()
+
+    assert compiler.simplify(path) == [["move", 150]]
+    assert displacement(compiler.compile(path).commands) == (150, 0)
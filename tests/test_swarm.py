@@ -0,0 +1,71 @@
+import threading
+import time
+from types import SimpleNamespace
+from src.controllers.command_executor import CommandExecutor
+from src.controllers.drone_controller import Controller
+from src.controllers.rc_stream import HOVER, RCStreamer
+from src.controllers.swarm import Swarm
+
+
+class RecordingController(Controller):
+    """A **Controller** that records the calls instead of connecting to a drone"""
+
+    def __init__(self, host: str, gate: threading.Event | None = None):
+        self.drone = SimpleNamespace(address=(host, 8889))
+        self.gate = gate
+        self.calls = []
+
+    def go(self, x: int, y: int, z: int, speed: int):
+        if self.gate is not None:
+            self.gate.wait(1.0)
+
+        self.calls.append(("go", x, y, z, speed))
+
+    def send_rc(self, left_right: int, forward_back: int, up_down: int, yaw: int):
+        self.calls.append(("send_rc", left_right, forward_back, up_down, yaw))
+
+    def close(self):
+        pass
+
+
+def test_queued_commands_keep_their_drones():
+    gate = threading.Event()
+    first = RecordingController("10.0.0.1", gate)
+    second = RecordingController("10.0.0.2")
+    swarm = Swarm([first, second])
+    swarm.select(1)
+
+    executor = CommandExecutor(swarm)
+    executor.start()
+    # The first command blocks until the drone number 2 is selected
+    commands = [executor.submit("go", 50, 0, 0, 50, targets=swarm.selected)]
+    commands.append(executor.submit("go", 60, 0, 0, 50, targets=swarm.selected))
+    swarm.select(2)
+    gate.set()
+
+    for command in commands:
+        assert command.done.wait(2.0)
+
+    executor.stop()
+    swarm.close()
+
+    assert first.calls == [("go", 50, 0, 0, 50), ("go", 60, 0, 0, 50)]
+    assert second.calls == []
+
+
+def test_rc_stream_stops_the_drones_it_leaves():
+    first, second = RecordingController("10.0.0.1"), RecordingController("10.0.0.2")
+    swarm = Swarm([first, second])
+
+    with RCStreamer(swarm, rate=100, max_step=100) as streamer:
+        streamer.setTarget(0, 50, 0, 0, targets=["10.0.0.1"])
+        time.sleep(0.05)
+        streamer.setTarget(0, 50, 0, 0, targets=["10.0.0.2"])
+        time.sleep(0.05)
+
+    swarm.close()
+
+    assert first.calls[-1] == ("send_rc", *HOVER)
+    assert ("send_rc", 0, 50, 0, 0) in first.calls
+    assert ("send_rc", 0, 50, 0, 0) in second.calls
+    assert second.calls[-1] == ("send_rc", *HOVER)
@@ -0,0 +1,231 @@
+import glob
+import json
+import os
+import platform
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+import cv2
+
+
+cache_path = "data/camera_cache.json"
+
+# Checked on every camera found, from the smallest to the largest
+RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+
+
+@dataclass
+class CameraInfo:
+    index: int
+    identity: str | None  # Identifies the physical device behind the index, None if the system does not tell
+    name: str | None
+    resolutions: list[list[int]] = field(default_factory=list)  # [width, height] pairs
+    fps: float = 0.0
+
+
+def device_identity(index: int) -> tuple[str | None, str | None]:
+    """Reads the name and the bus path of the device behind the index without opening it. Only Linux exposes them, elsewhere (None, None) is returned.
+
+    :return: The identity and the name of the device
+    """
+    sysfs = f"/sys/class/video4linux/video{index}"
+
+    if not os.path.isdir(sysfs):
+        return None, None
+
+    try:
+        with open(os.path.join(sysfs, "name"), "r", encoding="utf-8") as file:
+            name = file.read().strip()
+
+    except OSError:
+        name = None
+
+    device = os.path.realpath(os.path.join(sysfs, "device"))
+
+    return f"{name}@{device}", name
+
+
+def candidate_indexes(max_index: int = 15) -> list[int]:
+    """:return: The indexes worth opening. On Linux only the existing /dev/video devices, elsewhere every index below **max_index**."""
+    if platform.system() == "Linux" and os.path.isdir("/dev"):
+        indexes = sorted(
+            int(match.group(1))
+            for path in glob.glob("/dev/video*")
+            if (match := re.fullmatch(r"/dev/video(\d+)", path))
+        )
+
+        return [index for index in indexes if index < max_index]
+
+    return list(range(max_index))
+
+
+def probe_camera(index: int, resolutions=RESOLUTIONS) -> CameraInfo | None:
+    """Opens the camera and checks which of the resolutions it supports and at what rate it captures.
+
+    :return: None if the camera could not be opened or did not return a frame
+    """
+    capture = cv2.VideoCapture(index)
+
+    try:
+        if not capture.isOpened() or not capture.read()[0]:
+            return None
+
+        supported = []
+        for width, height in resolutions:
+            capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+            size = [
+                int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            ]
+            # The driver falls back to the nearest size it supports
+            if size == [width, height]:
+                supported.append(size)
+
+        identity, name = device_identity(index)
+
+        return CameraInfo(
+            index=index,
+            identity=identity,
+            name=name,
+            resolutions=supported,
+            fps=float(capture.get(cv2.CAP_PROP_FPS) or 0.0),
+        )
+
+    finally:
+        capture.release()
+
+
+def probe_cameras(indexes: list[int], timeout: float = 3.0) -> list[CameraInfo]:
+    """Probes all the cameras at the same time. A camera that does not answer within the timeout is left out, its thread is abandoned because OpenCV calls cannot be interrupted.
+
+    :return: The cameras found, ordered by index
+    """
+    results = {}
+    lock = threading.Lock()
+
+    def probe(index: int):
+        info = probe_camera(index)
+
+        with lock:
+            results[index] = info
+
+    threads = [
+        threading.Thread(target=probe, args=(index,), daemon=True)
+        for index in indexes
+    ]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+
+    with lock:
+        return [results[index] for index in sorted(results) if results[index]]
+
+
+def _read_cache(path: str, max_age: float | None) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            content = json.load(file)
+
+    except (OSError, ValueError):
+        return None
+
+    if content.get("platform") != platform.platform():
+        return None
+
+    if max_age is not None and time.time() - content.get("created", 0) > max_age:
+        return None
+
+    return content
+
+
+def load_cache(
+    path: str = cache_path, max_age: float | None = None
+) -> list[CameraInfo] | None:
+    """:return: The cached cameras, None if there is no cache, it is older than **max_age** seconds or it was made on another system"""
+    content = _read_cache(path, max_age)
+
+    if content is None:
+        return None
+
+    return [CameraInfo(**camera) for camera in content.get("cameras", [])]
+
+
+def save_cache(
+    cameras: list[CameraInfo],
+    path: str = cache_path,
+    candidates: list[int] | None = None,
+):
+    """:param candidates: The indexes that were probed, a new device is noticed when they change"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "created": time.time(),
+                "platform": platform.platform(),
+                "candidates": candidates,
+                "cameras": [asdict(camera) for camera in cameras],
+            },
+            file,
+            indent=4,
+        )
+
+
+def discover_cameras(
+    max_index: int = 15,
+    timeout: float = 3.0,
+    refresh: bool = False,
+    max_age: float | None = 7 * 24 * 3600,
+    path: str = cache_path,
+) -> list[CameraInfo]:
+    """Finds the available cameras, from the cache when it is still valid, otherwise by probing them concurrently and caching the result.
+
+    :param max_index: The indexes below this one are checked
+    :param timeout: Seconds the probing can take in total
+    :param refresh: If True, the cache is ignored
+    :param max_age: Seconds after which the cache is ignored, None to always use it
+    :param path: Path of the cache file
+    """
+    candidates = candidate_indexes(max_index)
+    content = _read_cache(path, max_age) if not refresh else None
+
+    # The cache is valid only as long as the same devices are plugged in
+    if content is not None and content.get("candidates") == candidates:
+        cameras = [CameraInfo(**camera) for camera in content.get("cameras", [])]
+
+        if all(
+            camera.identity == device_identity(camera.index)[0] for camera in cameras
+        ):
+            return cameras
+
+    cameras = probe_cameras(candidates, timeout)
+    save_cache(cameras, path, candidates)
+
+    return cameras
+
+
+def validate_camera(
+    index: int, timeout: float = 3.0, path: str = cache_path
+) -> CameraInfo | None:
+    """Checks that the camera index from the config can be used. When the cache knows the device and it is still plugged in no camera is opened.
+
+    :return: The camera, None if it is not available
+    """
+    cameras = load_cache(path) or []
+    identity = device_identity(index)[0]
+
+    for camera in cameras:
+        if camera.index == index and camera.identity in (None, identity):
+            return camera
+
+    # Unknown or changed device, only this camera is probed and the cache is updated with it
+    found = probe_cameras([index], timeout)
+    cameras = [camera for camera in cameras if camera.index != index] + found
+    # The candidates are not stored, so the next discovery probes everything again
+    save_cache(sorted(cameras, key=lambda camera: camera.index), path)
+
+    return found[0] if found else None
@@ -3,6 +3,9 @@ import cv2
 
 
 class MathDrawing:
+    def __init__(self):
+        self.__circle_masks = {}
+
     def bresenham(self, x0, y0, x1, y1):
         pixels = []
         dx = abs(x1 - x0)
@@ -25,11 +28,16 @@ class MathDrawing:
 
         return pixels
 
-    def calculateLineByAngle(self, x0, y0, length, angle) -> list[tuple[int]]:
+    def pointByAngle(self, x0, y0, length, angle) -> tuple[int]:
         angle_rad = np.radians(angle)
         x1 = x0 + int(length * np.cos(angle_rad))
         y1 = y0 + int(length * np.sin(angle_rad))
 
+        return x1, y1
+
+    def calculateLineByAngle(self, x0, y0, length, angle) -> list[tuple[int]]:
+        x1, y1 = self.pointByAngle(x0, y0, length, angle)
+
         return self.bresenham(x0, y0, x1, y1)
 
     def drawLine(
@@ -38,6 +46,19 @@ class MathDrawing:
         for p in points:
             cv2.rectangle(frame, p, (p[0] + 1, p[1] + 1), color, 10)
 
+    def circleMask(self, size: int) -> np.ndarray:
+        """:param size: Radius of the circle
+        :return: A (size * 2, size * 2) boolean mask that is True inside the circle. The masks are cached per size.
+        """
+        mask = self.__circle_masks.get(size)
+
+        if mask is None:
+            mask = np.zeros((size * 2, size * 2), dtype=np.uint8)
+            cv2.circle(mask, (size, size), size - 1, 1, -1)
+            mask = self.__circle_masks[size] = mask.astype(bool)
+
+        return mask
+
     def drawMinimapOnFrame(
         self,
         frame1: np.ndarray,
@@ -45,32 +66,34 @@ class MathDrawing:
         position: list[int] | tuple[int],
         size: list[int] | tuple[int],
     ) -> np.ndarray:
-        frame2 = cv2.flip(frame2, 0)
-        frame2 = cv2.resize(frame2.copy(), (size * 2, size * 2))
-        frame2_size = frame2.shape
+        """Places the minimap inside a circle on the frame, the black pixels of the minimap are transparent.
 
-        for r in range(size, frame1.shape[1]):
-            cv2.circle(
-                frame2, (frame2_size[1] // 2, frame2_size[0] // 2), r, (0, 0, 0), 2
-            )
-
-        mask1 = cv2.inRange(frame2, (1, 0, 0), (255, 255, 255))
-        mask2 = cv2.inRange(frame2, (0, 1, 0), (255, 255, 255))
-        mask3 = cv2.inRange(frame2, (0, 0, 1), (255, 255, 255))
+        :param frame1: The frame on which the minimap is drawn, it is modified in place
+        :param frame2: The minimap
+        :param position: Top left corner of the minimap on the frame, the minimap may go past the edges of the frame
+        :param size: Radius of the circle
+        :return: The frame with the minimap
+        """
+        frame2 = cv2.flip(frame2, 0)
+        if frame2.shape[:2] != (size * 2, size * 2):
+            frame2 = cv2.resize(frame2, (size * 2, size * 2))
 
-        y1, y2 = position[1], position[1] + frame2.shape[0]
-        x1, x2 = position[0], position[0] + frame2.shape[1]
-        roi = frame1[y1:y2, x1:x2]
+        # The part of the minimap that is inside the frame
+        x1, y1 = max(position[0], 0), max(position[1], 0)
+        x2 = min(position[0] + size * 2, frame1.shape[1])
+        y2 = min(position[1] + size * 2, frame1.shape[0])
 
-        roi[mask1 > 0] = frame2[mask1 > 0]
-        roi[mask2 > 0] = frame2[mask2 > 0]
-        roi[mask3 > 0] = frame2[mask3 > 0]
+        if x1 < x2 and y1 < y2:
+            ox, oy = x1 - position[0], y1 - position[1]
+            frame2 = frame2[oy : oy + y2 - y1, ox : ox + x2 - x1]
+            mask = self.circleMask(size)[oy : oy + y2 - y1, ox : ox + x2 - x1]
+            mask = mask & frame2.any(axis=2)
 
-        frame1[y1:y2, x1:x2] = roi
+            np.copyto(frame1[y1:y2, x1:x2], frame2, where=mask[..., None])
 
         cv2.circle(
             frame1,
-            (position[0] + frame2_size[0] // 2, position[1] + frame2_size[1] // 2),
+            (position[0] + size, position[1] + size),
             size,
             (0, 0, 0),
             2,
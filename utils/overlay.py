@@ -0,0 +1,164 @@
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+
+def draw_skeleton(
+    frame: np.ndarray,
+    points: np.ndarray,
+    connections: np.ndarray,
+    line_color: tuple[int] = (224, 224, 224),
+    point_color: tuple[int] = (0, 0, 255),
+    thickness: int = 2,
+    point_size: int = 6,
+):
+    """Draws the bones and the joints of any number of hands with two OpenCV calls, instead of one call per line and point.
+
+    :param frame: The frame the hands are drawn on, it is modified in place
+    :param points: An (n, points, 2) or (points, 2) int32 array with the pixel coordinates of the joints
+    :param connections: A (k, 2) array with the indexes of the joints joined by a line
+    :param point_size: Diameter of the joints in pixels
+    """
+    points = points.reshape(-1, points.shape[-2], 2).astype(np.int32, copy=False)
+
+    # Every bone is a polyline of two points, all of them are drawn by the same call
+    cv2.polylines(
+        frame, points[:, connections].reshape(-1, 2, 2), False, line_color, thickness
+    )
+    # A closed polyline of a single point is a dot as thick as the line
+    cv2.polylines(frame, points.reshape(-1, 1, 2), True, point_color, point_size)
+
+
+class OverlayRenderer:
+    def __init__(
+        self,
+        connections,
+        font: int = cv2.FONT_HERSHEY_SIMPLEX,
+        cache_size: int = 256,
+    ):
+        """Collects everything drawn over the frame during an iteration (hand skeletons and HUD texts) and draws it at once with **compose**.
+
+        Each text is rendered once and the positions of its pixels are cached, so a line of the HUD that does not change is not rendered again; the pixels of all the texts of the same color are then written with one assignment. The skeletons of all the hands are drawn with the same two calls.
+        Texts that change every frame (counters, telemetry) would never be found in the cache and would push the static ones out of it, they are queued with **cache=False** and drawn directly with **cv2.putText**.
+
+        :param connections: The pairs of points joined when a hand is drawn. Example: **HAND_CONNECTIONS**
+        :param font: OpenCV font of the texts
+        :param cache_size: How many rendered texts are kept, the least recently used ones are dropped first
+        """
+        self.connections = np.array(sorted(connections), dtype=np.int32)
+        self.font = font
+        self.cache_size = cache_size
+
+        self.__texts = []
+        self.__dynamic_texts = []
+        self.__skeletons = []
+        self.__sprites = OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """:return: How many elements are waiting for the next **compose**"""
+        return len(self.__texts) + len(self.__dynamic_texts) + len(self.__skeletons)
+
+    def text(
+        self,
+        text: str,
+        position: list[int] | tuple[int],
+        color: tuple[int] = (0, 0, 255),
+        scale: float = 0.5,
+        thickness: int = 2,
+        cache: bool = True,
+    ):
+        """Queues a text, with the same parameters as **cv2.putText**
+
+        :param position: Bottom left corner of the text
+        :param cache: False for a text that changes often, it is drawn without going through the cache
+        """
+        (self.__texts if cache else self.__dynamic_texts).append(
+            ((text, tuple(color), scale, thickness), (int(position[0]), int(position[1])))
+        )
+
+    def skeleton(self, hand_landmarks: np.ndarray):
+        """Queues a hand.
+
+        :param hand_landmarks: A (21, 3) array with the normalized coordinates of the hand
+        """
+        self.__skeletons.append(hand_landmarks[:, :2])
+
+    def clear(self):
+        """Drops what was queued without drawing it"""
+        self.__texts = []
+        self.__dynamic_texts = []
+        self.__skeletons = []
+
+    def __sprite(self, key: tuple) -> tuple[np.ndarray, np.ndarray, tuple[int]]:
+        """:return: The y and x offsets of the pixels of the rendered text from its position, and their bounds (top, bottom, left, right)"""
+        sprite = self.__sprites.get(key)
+
+        if sprite is not None:
+            self.__sprites.move_to_end(key)
+
+            return sprite
+
+        text, _, scale, thickness = key
+        (width, height), baseline = cv2.getTextSize(text, self.font, scale, thickness)
+        pad = thickness
+        mask = np.zeros((height + baseline + pad * 2, width + pad * 2), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, height + pad), self.font, scale, 255, thickness)
+
+        ys, xs = np.nonzero(mask)
+        top, left = -height - pad, -pad
+        sprite = self.__sprites[key] = (
+            (ys + top).astype(np.intp),
+            (xs + left).astype(np.intp),
+            (top, top + mask.shape[0], left, left + mask.shape[1]),
+        )
+
+        if len(self.__sprites) > self.cache_size:
+            self.__sprites.popitem(last=False)
+
+        return sprite
+
+    def compose(self, frame: np.ndarray) -> np.ndarray:
+        """Draws everything that was queued on the frame, the skeletons under the texts, and empties the queue
+
+        :param frame: The BGR frame, it is modified in place
+        :return: The frame
+        """
+        if self.__skeletons:
+            size = np.array((frame.shape[1], frame.shape[0]), dtype=np.float32)
+            draw_skeleton(frame, np.stack(self.__skeletons) * size, self.connections)
+
+        height, width = frame.shape[:2]
+        pixels = {}  # color -> indexes of the pixels in the flattened frame
+
+        for key, (x, y) in self.__texts:
+            ys, xs, (top, bottom, left, right) = self.__sprite(key)
+
+            if y + bottom <= 0 or y + top >= height or x + right <= 0 or x + left >= width:
+                continue
+
+            ys, xs = ys + y, xs + x
+
+            if y + top < 0 or y + bottom > height or x + left < 0 or x + right > width:
+                inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+                ys, xs = ys[inside], xs[inside]
+
+            pixels.setdefault(key[1], []).append(ys * width + xs)
+
+        # The pixels of all the texts of the same color are written by a single assignment
+        flat = frame.reshape(-1, frame.shape[2]) if frame.flags.c_contiguous else None
+        for color, indexes in pixels.items():
+            indexes = np.concatenate(indexes)
+
+            if flat is not None:
+                flat[indexes] = color
+
+            else:  # A view of a larger image cannot be flattened without a copy
+                frame[indexes // width, indexes % width] = color
+
+        for (text, color, scale, thickness), position in self.__dynamic_texts:
+            cv2.putText(frame, text, position, self.font, scale, color, thickness)
+
+        self.clear()
+
+        return frame
@@ -0,0 +1,47 @@
+import numpy as np
+import cv2
+
+
+class FramePreprocessor:
+    def __init__(self, source_rgb: bool = False, mirror: bool = True):
+        """Prepares each captured frame for display (BGR) and for MediaPipe (RGB) with two passes over the image and no new allocations.
+
+        The output buffers are allocated on the first frame and reused as long as the frame size does not change, so the returned arrays are overwritten by the next call.
+
+        :param source_rgb: True if the frames are captured in RGB format (the drone stream), False for BGR (OpenCV cameras)
+        :param mirror: If True, the frames are flipped horizontally so that the image works like a mirror
+        """
+        self.source_rgb = source_rgb
+        self.mirror = mirror
+        self.__display = None
+        self.__rgb = None
+
+    def __allocate(self, frame: np.ndarray):
+        if self.__display is None or self.__display.shape != frame.shape:
+            self.__display = np.empty_like(frame)
+            self.__rgb = np.empty_like(frame)
+
+    def process(self, frame: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """:param frame: The captured frame, it is not modified
+        :return: The BGR frame to draw on and display and the RGB frame for MediaPipe
+        """
+        self.__allocate(frame)
+
+        # The flip is done in the format of the source, and the conversion writes straight into the other buffer.
+        if self.source_rgb:
+            source, converted = self.__rgb, self.__display
+        else:
+            source, converted = self.__display, self.__rgb
+
+        if self.mirror:
+            cv2.flip(frame, 1, dst=source)
+        else:
+            np.copyto(source, frame)
+
+        cv2.cvtColor(
+            source,
+            cv2.COLOR_RGB2BGR if self.source_rgb else cv2.COLOR_BGR2RGB,
+            dst=converted,
+        )
+
+        return self.__display, self.__rgb
@@ -0,0 +1,256 @@
+import json
+import os
+import re
+import socket
+import time
+from collections import deque
+import numpy as np
+
+
+class _Stage:
+    """Context manager that measures one stage, it is reused for every measurement of the stage"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "StageProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+        return self
+
+    def __exit__(self, *_):
+        self.profiler.record(self.name, (time.perf_counter_ns() - self.start) / 1e9)
+
+
+class _NullStage:
+    """Used when the profiler is disabled, so that measuring a stage costs nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageProfiler:
+    def __init__(self, enabled: bool = True, window: int = 300):
+        """Measures how long the stages of the frame loop take and counts events.
+
+        The latest durations of each stage are kept in a rolling window, from which the percentiles are computed on request.
+
+        :param enabled: If False, the measurements and the counters are skipped
+        :param window: How many of the latest durations are kept for each stage
+        """
+        self.enabled = enabled
+        self.window = window
+        self.__stages = {}
+        self.__durations = {}
+        self.__totals = {}  # stage -> [count, sum of the durations]
+        self.counters = {}
+
+    def stage(self, name: str):
+        """Measures the code inside the **with** block.
+
+        Example: ``with profiler.stage("getHands"): ...``
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+
+        stage = self.__stages.get(name)
+        if stage is None:
+            stage = self.__stages[name] = _Stage(self, name)
+
+        return stage
+
+    def record(self, name: str, duration: float):
+        """Registers the duration of a stage in seconds"""
+        durations = self.__durations.get(name)
+        if durations is None:
+            durations = self.__durations[name] = deque(maxlen=self.window)
+            self.__totals[name] = [0, 0.0]
+
+        durations.append(duration)
+        totals = self.__totals[name]
+        totals[0] += 1
+        totals[1] += duration
+
+    def count(self, name: str, n: int = 1):
+        """Increments a counter"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def setCounter(self, name: str, value: int):
+        """Sets a counter that is kept somewhere else, for example the dropped frames of the capture"""
+        if self.enabled:
+            self.counters[name] = value
+
+    def reset(self):
+        self.__durations.clear()
+        self.__totals.clear()
+        self.counters.clear()
+
+    def percentiles(self, name: str) -> dict[str, float] | None:
+        """:return: The p50, p95 and p99 of the stage in milliseconds over the window, None if it was not measured"""
+        durations = self.__durations.get(name)
+
+        if not durations:
+            return None
+
+        p50, p95, p99 = np.percentile(np.array(durations) * 1000, (50, 95, 99))
+
+        return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+    def snapshot(self) -> dict:
+        """:return: The percentiles and totals of every stage and the counters"""
+        stages = {}
+
+        for name in self.__durations:
+            count, total = self.__totals[name]
+            stages[name] = {
+                "count": count,
+                "total_s": round(total, 6),
+                **{
+                    key: round(value, 4)
+                    for key, value in self.percentiles(name).items()
+                },
+            }
+
+        return {"time": time.time(), "stages": stages, "counters": dict(self.counters)}
+
+    def hudLines(self) -> list[str]:
+        """:return: One text line per stage with its p50/p95/p99, for drawing on the frame"""
+        lines = []
+
+        for name in self.__durations:
+            p = self.percentiles(name)
+            lines.append(
+                f"{name}: {p['p50_ms']:.1f} / {p['p95_ms']:.1f} / {p['p99_ms']:.1f} ms"
+            )
+
+        lines.extend(f"{name}: {value}" for name, value in self.counters.items())
+
+        return lines
+
+    def prometheusText(self, prefix: str = "ccdrone") -> str:
+        """:return: The stages as summaries and the counters in the Prometheus text format"""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Duration of the stages of the frame loop",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+
+        for name in self.__durations:
+            count, total = self.__totals[name]
+            durations = np.array(self.__durations[name])
+
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(
+                    f'{prefix}_stage_seconds{{stage="{name}",quantile="{quantile}"}} '
+                    f"{np.quantile(durations, quantile):.9f}"
+                )
+
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {total:.9f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {count}')
+
+        for name, value in self.counters.items():
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    def __init__(self, target: str, format: str = "jsonl", interval: float = 5.0):
+        """Periodically writes the measurements of a **StageProfiler** to a local file or socket.
+
+        :param target: A file path, "udp://host:port" or "tcp://host:port"
+        :param format: "jsonl" appends a JSON line per export, "prometheus" writes the Prometheus text format (the file is replaced on every export)
+        :param interval: Seconds between two exports
+        """
+        if format not in ("jsonl", "prometheus"):
+            raise ValueError(f"Unknown metrics format: {format}")
+
+        self.target = target
+        self.format = format
+        self.interval = interval
+        self.__last_export = time.monotonic()
+        self.__socket = None
+        self.__address = None
+
+        match = re.fullmatch(r"(udp|tcp)://([^:]+):(\d+)", target)
+        if match:
+            self.__protocol = match.group(1)
+            self.__address = (match.group(2), int(match.group(3)))
+
+        else:
+            self.__protocol = "file"
+
+    def maybeExport(self, profiler: StageProfiler):
+        """Exports if the interval has passed since the previous export"""
+        now = time.monotonic()
+
+        if now - self.__last_export >= self.interval:
+            self.__last_export = now
+            self.export(profiler)
+
+    def export(self, profiler: StageProfiler):
+        if self.format == "jsonl":
+            data = json.dumps(profiler.snapshot()) + "\n"
+        else:
+            data = profiler.prometheusText()
+
+        try:
+            if self.__protocol == "file":
+                self.__writeFile(data)
+            else:
+                self.__send(data.encode("utf-8"))
+
+        except OSError as err:
+            # The metrics must never stop the frame loop
+            print(f"ERROR: could not export the metrics to {self.target}: {err}")
+            self.__closeSocket()
+
+    def __writeFile(self, data: str):
+        if self.format == "jsonl":
+            with open(self.target, "a", encoding="utf-8") as file:
+                file.write(data)
+
+            return
+
+        # The file is replaced at once, so a reader never sees half of it
+        temporary = f"{self.target}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(data)
+
+        os.replace(temporary, self.target)
+
+    def __send(self, data: bytes):
+        if self.__protocol == "udp":
+            if self.__socket is None:
+                self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+            self.__socket.sendto(data, self.__address)
+
+            return
+
+        if self.__socket is None:
+            self.__socket = socket.create_connection(self.__address, timeout=1.0)
+
+        self.__socket.sendall(data)
+
+    def __closeSocket(self):
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+
+    def close(self):
+        self.__closeSocket()
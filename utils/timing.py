@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class FpsCounter:
+    def __init__(self, window: int = 30):
+        """Measures the rate of recurring events (frames) over a sliding window of the most recent ones.
+
+        :param window: How many of the latest event timestamps are used to compute the rate
+        """
+        self.__timestamps = deque(maxlen=window)
+
+    def tick(self, timestamp: float | None = None):
+        """Registers an event.
+
+        :param timestamp: Time of the event from **time.perf_counter**; the current time is used when omitted
+        """
+        self.__timestamps.append(
+            time.perf_counter() if timestamp is None else timestamp
+        )
+
+    def reset(self):
+        self.__timestamps.clear()
+
+    @property
+    def fps(self) -> float:
+        """:return: Events per second over the window, 0 if there are not enough events yet"""
+        if len(self.__timestamps) < 2:
+            return 0.0
+
+        elapsed = self.__timestamps[-1] - self.__timestamps[0]
+
+        return (len(self.__timestamps) - 1) / elapsed if elapsed > 0 else 0.0
+
+
+class StartupTimer:
+    def __init__(self, start: float | None = None):
+        """Measures how long each step of the startup takes, including the ones that run on other threads.
+
+        :param start: **time.perf_counter** value of the start of the program, by default the creation of the timer
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.steps = {}  # name -> seconds
+        self.__lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self.__lock:
+            self.steps[name] = seconds
+
+    def mark(self, name: str):
+        """Records the time elapsed since the start of the program"""
+        self.record(name, time.perf_counter() - self.start)
+
+    @contextmanager
+    def step(self, name: str):
+        """Records how long the block takes"""
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> dict[str, float]:
+        """:return: The duration of each step in milliseconds"""
+        with self.__lock:
+            return {name: round(seconds * 1000, 1) for name, seconds in self.steps.items()}
@@ -1,21 +1,25 @@
 import cv2
 import os
 from utils import file_manager
+from utils.camera_discovery import discover_cameras
 
 
 config_path = "data/config.json"
 
 
-def get_avaible_cams() -> list[str]:
-    cams = ["drone"]
+def get_avaible_cams(refresh: bool = True) -> list[str]:
+    """The cameras are probed at the same time and the result is cached for the validation done by main.py
 
-    for i in range(15):
-        cap = cv2.VideoCapture(i)
+    :param refresh: If False, the cached cameras are used when the same devices are still plugged in
+    """
+    cams = ["drone"]
 
-        if cap.isOpened():
-            print(i)
-            cams.append(str(i))
-            cap.release()
+    for camera in discover_cameras(refresh=refresh):
+        resolutions = ", ".join(f"{w}x{h}" for w, h in camera.resolutions)
+        print(
+            f"{camera.index}: {camera.name or 'camera'} ({resolutions or 'default resolution'}, {camera.fps:g} fps)"
+        )
+        cams.append(str(camera.index))
 
     return cams
 